@@ -35,28 +35,38 @@ from cifkit.preprocessors.environment import get_site_connections
 from cifkit.preprocessors.environment_util import flat_site_connections
 
 # Supercell generation
-from cifkit.preprocessors.supercell import get_supercell_points
-from cifkit.preprocessors.supercell_util import get_cell_atom_count
+from cifkit.preprocessors.supercell import (
+    CellPoints,
+    get_points_for_plotting,
+    get_supercell_points_from_unitcell,
+    get_supercell_shifts,
+    get_unitcell_points,
+)
+from cifkit.preprocessors.supercell_util import (
+    DEFAULT_CUTOFF_RADIUS,
+    get_cell_atom_count,
+    get_supercell_extents,
+)
 from cifkit.utils.bond_pair import get_bond_pairs, get_pairs_sorted_by_mendeleev
 
 # Edit .cif file
-from cifkit.utils.cif_editor import edit_cif_file_based_on_db
+from cifkit.utils.cif_editor import edit_cif_content_based_on_db
 
 # Parser .cif file
 from cifkit.utils.cif_parser import (
-    get_cif_block,
+    decode_cif_content,
+    get_atom_site_info_from_table,
+    get_atom_site_table,
+    get_cif_block_from_content,
+    get_cif_content,
     get_formula_structure_weight_s_group,
-    get_loop_values,
     get_tag_from_third_line,
-    get_unique_elements_from_loop,
-    get_unique_site_labels,
-    get_unitcell_angles_rad,
-    get_unitcell_lengths,
-    parse_atom_site_occupancy_info,
+    get_unitcell_parameters_and_uncertainties,
 )
 
 # Identify .cif database source
 from cifkit.utils.cif_sourcer import get_cif_db_source
+from cifkit.utils.lattice import Lattice
 
 # Utility
 from cifkit.utils.log_messages import CifLog
@@ -89,26 +99,37 @@ class Cif:
         logging_enabled=False,
         supercell_size=3,
         compute_CN=False,
+        content=None,
     ) -> None:
         """Initialize an object from a .cif file.
 
         Parameters
         ----------
         file_path : str
-            Path to the .cif file.
+            Path to the .cif file, which may be compressed with gzip (.cif.gz).
+            If `content` is provided, the path is only used to name the
+            structure and is never opened.
         is_formatted : bool, default
             If False, preprocess the .cif file to ensure compatibility with the
-            gemmi library.
+            gemmi library. The preprocessed text is written back to `file_path`
+            only when the object is initialized from a file.
         logging_enabled : bool, default False
             Enables detailed logging during initialization and for distance
             calculations.
-        supercell_size : int, default 3
+        supercell_size : int or tuple[int, int, int] or "auto", default 3
             Size of the supercell to be generated. Default is 3.
             Method 1 - No shifts
             Method 2 - ±1 shifts  (3x3x3 of the unit cell)
             Method 3 - ±2 shifts (5×5×5 of the unit cell)
+            A tuple (n_a, n_b, n_c) gives ±n shifts along each axis, and "auto"
+            the shifts needed per axis for the default cutoff radius of
+            `compute_connections`. Connections are always computed with a
+            supercell just large enough for their cutoff radius.
         compute_CN : bool, default False
             Option to compute CN related metrics for each Cif object.
+        content : str or bytes, optional
+            Text of the .cif file, e.g., read from object storage or an archive.
+            Preprocessing and parsing are done in memory without temp files.
 
         Attributes
         ----------
@@ -130,14 +151,34 @@ class Cif:
             Angstroms.
         unitcell_angles : list[float]
             List of unit cell angles in radians, ordered by alpha, beta, gamma.
+        lattice : Lattice
+            Lattice of the unit cell with the fractional to Cartesian matrix,
+            its inverse and the metric tensor.
+        unitcell_lengths_su : list[float]
+            Standard uncertainties of the unit cell lengths, NaN if not given.
+        unitcell_angles_su : list[float]
+            Standard uncertainties of the unit cell angles in radians, NaN if
+            not given.
+        weight_su : float
+            Standard uncertainty of the formula weight, NaN if not given and
+            None without a weight.
         site_labels : list[str]
             Lists all unique atomic site labels.
         unique_elements : set[str]
             Set of unique chemical elements present in the CIF file.
+        atom_site_table : np.ndarray
+            Structured array with one row per atomic site, holding the
+            label_index, element_index, multiplicity, wyckoff, x, y, z and
+            occupancy fields, and the standard uncertainties in x_su, y_su,
+            z_su and occupancy_su. label_index refers to `site_labels` and
+            element_index to `atom_site_elements`.
+        atom_site_elements : list[str]
+            Elements of the atomic sites in the order of their first site.
         atom_site_info : dict[str, any]
             Dictionary containing detailed information about each atomic site
             including element, site occupancy,
-            fractional coordinates, symmetry, and multiplicity.
+            fractional coordinates, symmetry, and multiplicity. Built from
+            `atom_site_table` when first accessed.
         composition_type : int
             Number of unique elements present in the .cif file, e.g., 1 for
             unary, 2 for binary, etc.
@@ -170,18 +211,29 @@ class Cif:
         mixing_info_per_label_pair_sorted_by_mendeleev : dict
             Same as `mixing_info_per_label_pair`, but sorted according to
             Mendeleev numbers.
-        unitcell_points : list[list[tuple[float, float, float, str]]]
-            List of points defining the unit cell; each point contains
-            fractional coordinates and a site label.
-        supercell_points : list[list[tuple[float, float, float, str]]]
-            List of points defining the supercell of the cell For each .cif file,
+        unitcell_points : CellPoints
+            Points defining the unit cell, stored as an (N, 3) array of
+            fractional coordinates and an array of site label indices, and
+            read as a sequence of (x, y, z, label) tuples.
+        supercell_size : int or tuple[int, int, int]
+            Size of the supercell, with "auto" resolved to per-axis extents.
+        supercell_points : CellPoints
+            Points defining the supercell of the cell For each .cif file,
             a unit cell is generated by applying the symmetry operations.
             A supercell is generated by applying ±1 shifts from the unit cell.
+            Generated when first accessed and released by `release_geometry`.
+        unitcell_points_for_plotting : CellPoints
+            Unit cell points with the boundary atoms duplicated on the
+            opposite faces. Generated when first accessed and released by
+            `release_geometry`.
+        supercell_points_for_plotting : CellPoints
+            Same as `unitcell_points_for_plotting` for the supercell.
         unitcell_atom_count : int
             Total count of atoms within the unit cell.
         supercell_atom_count : int
             Total count of atoms within the generated supercell
-            incorporating ±1, ±1, ±1 translations.
+            incorporating ±1, ±1, ±1 translations. Counted when first
+            accessed.
         connections : None or dict
             Initially None, intended to store connection data related to
             the crystal structure. Connections are computed lazily and are
@@ -193,14 +245,27 @@ class Cif:
         # Initialize the Cif object with the file path.
         self.file_name = os.path.basename(file_path)
         self.file_name_without_ext = os.path.splitext(self.file_name)[0]
-        self.db_source = get_cif_db_source(self.file_path)
         # Private attribute to store connections
         self.connections = None
         self._shortest_pair_distance = None
+        self._atom_site_info = None
+        # Geometry computed on first access, see `release_geometry`
+        self._supercell_points = None
+        self._supercell_atom_count = None
+        self._unitcell_points_for_plotting = None
+        self._supercell_points_for_plotting = None
+        # Read the file once and share its content with every parser below
+        if content is None:
+            cif_content = get_cif_content(self.file_path)
+        else:
+            cif_content = decode_cif_content(content)
         # Pre-process if .cif has not been formatted
         if not is_formatted:
-            self._preprocess()
-        self._load_data(supercell_size)
+            # Compressed files are preprocessed in memory only
+            is_written = content is None and not self.file_path.endswith(".gz")
+            cif_content = self._preprocess(cif_content, is_written=is_written)
+        self.db_source = get_cif_db_source(self.file_path, content=cif_content)
+        self._load_data(supercell_size, cif_content)
         if compute_CN:
             self.compute_CN()
 
@@ -212,36 +277,55 @@ class Cif:
             )
             logging.info(formatted_message)
 
-    def _preprocess(self):
+    def _preprocess(self, cif_content, is_written=True):
         """Preprocess each .cif file before initializng and separate
-        files with error."""
-        self._log_info(CifLog.PREPROCESSING.value)
-        edit_cif_file_based_on_db(self.file_path)
+        files with error.
 
-    def _load_data(self, supercell_size):
-        """Load data from the .cif file and extract attributes."""
+        Return the preprocessed content and write it back to the file
+        if `is_written` is True and the content has been modified.
+        """
+        self._log_info(CifLog.PREPROCESSING.value)
+        modified_content = edit_cif_content_based_on_db(cif_content, self.file_path)
+        if is_written and modified_content != cif_content:
+            with open(self.file_path, "w") as f:
+                f.write(modified_content)
+        return modified_content
+
+    def _load_data(self, supercell_size, cif_content):
+        """Load data from the .cif file content and extract
+        attributes."""
         self._log_info(CifLog.LOADING_DATA.value)
-        self._block = get_cif_block(self.file_path)
-        self._parse_cif_data()
+        self._block = get_cif_block_from_content(cif_content)
+        self._parse_cif_data(cif_content)
         self._generate_supercell(supercell_size)
 
-    def _parse_cif_data(self):
+    def _parse_cif_data(self, cif_content):
         """Parse the main CIF data from the block."""
-        self._loop_values = get_loop_values(self._block)
-        self.unitcell_lengths = get_unitcell_lengths(self._block)
-        self.unitcell_angles = get_unitcell_angles_rad(self._block)
-        self.site_labels = get_unique_site_labels(self._loop_values)
-        self.unique_elements = get_unique_elements_from_loop(self._loop_values)
+        (
+            self.atom_site_table,
+            self.site_labels,
+            self.atom_site_elements,
+        ) = get_atom_site_table(self._block)
+        (
+            self.unitcell_lengths,
+            self.unitcell_angles,
+            self.unitcell_lengths_su,
+            self.unitcell_angles_su,
+        ) = get_unitcell_parameters_and_uncertainties(self._block)
+        self.lattice = Lattice(self.unitcell_lengths, self.unitcell_angles)
+        self.unique_elements = set(self.atom_site_elements)
         (
             self.formula,
             self.structure,
             self.weight,
             self.space_group_number,
             self.space_group_name,
-        ) = get_formula_structure_weight_s_group(self._block)
-        self.atom_site_info = parse_atom_site_occupancy_info(self.file_path)
+            self.weight_su,
+        ) = get_formula_structure_weight_s_group(self._block, with_weight_su=True)
         self.composition_type = len(self.unique_elements)
-        self.tag = get_tag_from_third_line(self.file_path, self.db_source)
+        self.tag = get_tag_from_third_line(
+            self.file_path, self.db_source, content=cif_content
+        )
         self.bond_pairs = get_bond_pairs(self.unique_elements)
         self.site_label_pairs = get_bond_pairs(self.site_labels)
         self.bond_pairs_sorted_by_mendeleev = get_pairs_sorted_by_mendeleev(
@@ -251,38 +335,92 @@ class Cif:
             self.site_labels
         )
         self.site_mixing_type = get_site_mixing_type(
-            self.site_labels, self.atom_site_info
+            self.site_labels, self.atom_site_table
         )
         self.is_radius_data_available = radius.are_available(list(self.unique_elements))
         self.mixing_info_per_label_pair = get_mixing_type_per_pair_dict(
-            self.site_labels, self.site_label_pairs, self.atom_site_info
+            self.site_labels, self.site_label_pairs, self.atom_site_table
         )
         self.mixing_info_per_label_pair_sorted_by_mendeleev = (
             get_mixing_type_per_pair_dict(
                 self.site_labels,
                 self.site_label_pairs_sorted_by_mendeleev,
-                self.atom_site_info,
+                self.atom_site_table,
             )
         )
 
     def _generate_supercell(self, supercell_size) -> None:
-        """Generate supercell information based on the unit cell data.
+        """Generate the unit cell points based on the unit cell data.
 
-        This method calculates the supercell points and atom counts based
-        on the unit cell data. It uses the `get_supercell_points` and
-        `get_cell_atom_count` functions to perform the calculations.
+        This method applies the symmetry operations with
+        `get_unitcell_points`. The supercell and the points for plotting
+        are only generated when first accessed.
         """
-        # Method implementation goes here
-        self.unitcell_points = get_supercell_points(self._block, 1)
-        self.supercell_points = get_supercell_points(self._block, supercell_size)
-        self.unitcell_points_for_plotting = self._generate_points_for_plotting(
-            self.unitcell_points
-        )
-        self.supercell_points_for_plotting = self._generate_points_for_plotting(
-            self.supercell_points
+        if supercell_size == "auto":
+            supercell_size = get_supercell_extents(
+                DEFAULT_CUTOFF_RADIUS, self.unitcell_lengths, self.unitcell_angles
+            )
+        # Raise for an invalid size now rather than on first access
+        get_supercell_shifts(supercell_size)
+        self.supercell_size = supercell_size
+        self.unitcell_points = get_unitcell_points(
+            self._block, self.atom_site_table, self.site_labels
         )
         self.unitcell_atom_count = get_cell_atom_count(self.unitcell_points)
-        self.supercell_atom_count = get_cell_atom_count(self.supercell_points)
+
+    @property
+    def supercell_points(self) -> CellPoints:
+        """Lazily generate the supercell by translating the unit cell."""
+        if self._supercell_points is None:
+            self._supercell_points = get_supercell_points_from_unitcell(
+                self.unitcell_points, self.supercell_size
+            )
+        return self._supercell_points
+
+    @property
+    def supercell_atom_count(self) -> int:
+        """Lazily count the atoms of the supercell, which is kept after
+        the supercell is released."""
+        if self._supercell_atom_count is None:
+            if self._supercell_points is None:
+                # Count without holding on to the supercell
+                supercell_points = get_supercell_points_from_unitcell(
+                    self.unitcell_points, self.supercell_size
+                )
+            else:
+                supercell_points = self._supercell_points
+            self._supercell_atom_count = get_cell_atom_count(supercell_points)
+        return self._supercell_atom_count
+
+    @property
+    def unitcell_points_for_plotting(self) -> CellPoints:
+        """Lazily generate the unit cell points with the boundary atoms
+        duplicated for visualization."""
+        if self._unitcell_points_for_plotting is None:
+            self._unitcell_points_for_plotting = self._generate_points_for_plotting(
+                self.unitcell_points
+            )
+        return self._unitcell_points_for_plotting
+
+    @property
+    def supercell_points_for_plotting(self) -> CellPoints:
+        """Lazily generate the supercell points with the boundary atoms
+        duplicated for visualization."""
+        if self._supercell_points_for_plotting is None:
+            self._supercell_points_for_plotting = self._generate_points_for_plotting(
+                self.supercell_points
+            )
+        return self._supercell_points_for_plotting
+
+    def release_geometry(self) -> None:
+        """Release the supercell and the points for plotting, e.g., to hold
+        many Cif objects in memory. They are generated again on access.
+
+        The unit cell points and the connections are kept.
+        """
+        self._supercell_points = None
+        self._unitcell_points_for_plotting = None
+        self._supercell_points_for_plotting = None
 
     def _generate_points_for_plotting(self, points, tolerance=1e-6):
         """Generate coordinate points for visualization with boundary
@@ -295,8 +433,8 @@ class Cif:
 
         Parameters
         ----------
-        points : list[list[tuple[float, float, float, str]]]
-            List of atom points where each point contains fractional coordinates
+        points : CellPoints
+            Atom points where each point contains fractional coordinates
             (x, y, z) and a site label.
         tolerance : float, default=1e-6
             Threshold for detecting boundary atoms. Coordinates within this
@@ -304,51 +442,20 @@ class Cif:
 
         Returns
         -------
-        list[list[tuple[float, float, float, str]]]
-            Processed list of points with boundary atoms duplicated. Each point
+        CellPoints
+            Processed points with boundary atoms duplicated. Each point
             is a tuple containing rounded fractional coordinates and site label.
             Corner atoms (0,0,0) will appear at all 8 corners, edge atoms on all
             corresponding edges, and face atoms on all corresponding faces.
         """
+        return get_points_for_plotting(points, tolerance)
 
-        all_coords = set()
-        for point in points:
-            new_x, new_y, new_z, atom_site_label = point
-
-            coords_list = []
-            # Build list of possible values for each dimension
-            x_vals = [new_x, 1.0 - new_x] if abs(new_x) < tolerance else [new_x]
-            if abs(new_x - 1.0) < tolerance:
-                x_vals.append(0.0)
-
-            y_vals = [new_y, 1.0 - new_y] if abs(new_y) < tolerance else [new_y]
-            if abs(new_y - 1.0) < tolerance:
-                y_vals.append(0.0)
-
-            z_vals = [new_z, 1.0 - new_z] if abs(new_z) < tolerance else [new_z]
-            if abs(new_z - 1.0) < tolerance:
-                z_vals.append(0.0)
-
-            # Generate all combinations
-            for dx in x_vals:
-                for dy in y_vals:
-                    for dz in z_vals:
-                        coord = (dx, dy, dz)
-                        coords_list.append(coord)
-
-            for coord in coords_list:
-                all_coords.add(
-                    (
-                        round(coord[0], 5),
-                        round(coord[1], 5),
-                        round(coord[2], 5),
-                        atom_site_label,
-                    )
-                )
-
-        return list(all_coords)
-
-    def compute_connections(self, cutoff_radius=10.0) -> None:
+    def compute_connections(
+        self,
+        cutoff_radius=DEFAULT_CUTOFF_RADIUS,
+        neighbor_search="periodic",
+        site_strategy="most_connected",
+    ) -> None:
         """Compute onnection network, shortest distances, bond counts,
         and coordination numbers (CN). These prperties are lazily loaded
         to avoid unnecessary computation during the initialization and
@@ -358,8 +465,28 @@ class Cif:
         ----------
         cutoff_radius : float, default=10.0
             The distance threshold in Angstroms used to consider two atoms as connected.
+            The unit cell is translated along each axis as far as needed for the
+            cutoff radius given the cell shape.
+        neighbor_search : str, default="periodic"
+            Method to find the neighbors within the cutoff radius of each site.
+            "periodic" translates the unit cell points by the lattice vectors
+            without building a supercell. "kdtree", "cell_list" and "brute"
+            search a supercell. All give identical connections.
+        site_strategy : str, default="most_connected"
+            Point of each site whose connections are kept. "most_connected"
+            computes the connections of every symmetry-equivalent point and keeps
+            the one with the most of the 50 shortest distances. "representative"
+            only computes those of the first point of each site.
         """
         self._log_info(CifLog.COMPUTE_CONNECTIONS.value)
+        supercell_points = None
+        if neighbor_search != "periodic":
+            supercell_points = get_supercell_points_from_unitcell(
+                self.unitcell_points,
+                get_supercell_extents(
+                    cutoff_radius, self.unitcell_lengths, self.unitcell_angles
+                ),
+            )
         self.connections = get_site_connections(
             [
                 self.site_labels,
@@ -367,8 +494,11 @@ class Cif:
                 self.unitcell_angles,
             ],
             self.unitcell_points,
-            self.supercell_points,
+            supercell_points,
             cutoff_radius=cutoff_radius,
+            lattice=self.lattice,
+            neighbor_search=neighbor_search,
+            site_strategy=site_strategy,
         )
         self._connections_flattened = flat_site_connections(self.connections)
         self._shortest_distance = get_shortest_distance(self.connections)
@@ -481,6 +611,16 @@ class Cif:
         self._CN_min_by_min_dist_method = min(self.CN_unique_values_by_min_dist_method)
         self._CN_min_by_best_methods = min(self.CN_unique_values_by_best_methods)
 
+    @property
+    def atom_site_info(self) -> dict[str, dict]:
+        """Lazily build the atom site dictionary keyed by site label from
+        `atom_site_table`."""
+        if self._atom_site_info is None:
+            self._atom_site_info = get_atom_site_info_from_table(
+                self.atom_site_table, self.site_labels, self.atom_site_elements
+            )
+        return self._atom_site_info
+
     @property
     @ensure_connections
     def shortest_distance(self):
@@ -1,10 +1,22 @@
 import logging
+import os
 from collections import Counter
 
 from cifkit import Cif
 from cifkit.figures.histogram import plot_histogram
-from cifkit.preprocessors.error import move_files_based_on_errors
-from cifkit.utils.cif_editor import edit_cif_file_based_on_db
+from cifkit.preprocessors.error import get_error_type, move_files_based_on_errors
+from cifkit.preprocessors.journal import PreprocessingJournal
+from cifkit.utils.cif_editor import edit_cif_files_based_on_db
+from cifkit.utils.cif_index import CifPack
+from cifkit.utils.cif_parser import decode_cif_content
+from cifkit.utils.cif_reader import (
+    get_block_file_path,
+    is_archive,
+    iter_archive_members,
+    iter_cif_blocks,
+    iter_cif_blocks_from_content,
+)
+from cifkit.utils.cif_scanner import scan_cif_files, scan_cif_header
 from cifkit.utils.folder import copy_files, get_file_paths, move_files
 from cifkit.utils.log_messages import CifEnsembleLog
 
@@ -18,6 +30,14 @@ class CifEnsemble:
         logging_enabled=False,
         supercell_size=3,
         compute_CN=False,
+        metadata_only=False,
+        multi_block=False,
+        index_path=None,
+        cif_ids=None,
+        use_journal=True,
+        n_workers=1,
+        quiet=False,
+        move_error_files=True,
     ) -> None:
         """Initialize a CifEnsemble object, containing a collection of
         Cif objects.
@@ -25,7 +45,13 @@ class CifEnsemble:
         Parameters
         ----------
         cif_dir_path : str
-            Path to the folder path containing .cif file(s).
+            Path to the folder path containing .cif file(s), or to a .zip, .tar
+            (optionally compressed) or .gz archive of .cif file(s). Archives are
+            read member by member without extraction, each file path is named
+            "<archive path>/<member name>", and files that fail to load are
+            recorded in error_manifest instead of being moved. Only uncompressed
+            .cif files are collected from a folder; .cif.gz files in it are
+            skipped, but each can be passed as an archive or loaded with Cif.
         add_nested_files : bool, optional
             Option to include .cif files contained in sub-directories within cif_dir_path
             , by default False
@@ -43,36 +69,150 @@ class CifEnsemble:
             Option to compute coordination numbers for each Cif object.
         logging_enabled : bool, optional
             Option to log while pre-processing Cif objects, by default False
+        metadata_only : bool, optional
+            Option to scan formula, structure, weight, space group, tag,
+            database source and elements from the raw text of each .cif file
+            instead of initializing Cif objects, by default False. No gemmi
+            parse, symmetry expansion or supercell generation is run, so only
+            the unique values, stats and filters based on these properties are
+            available. Combine with preprocess=False for the fastest scan.
+        multi_block : bool, optional
+            Option to read every data block of .cif files containing many
+            structures, e.g., COD or ICSD bulk exports, by default False. Each
+            block is streamed and preprocessed in memory, and its file path is
+            named "<file path>/<block name>.cif". Blocks that fail to load are
+            recorded in error_manifest instead of being moved. For archives,
+            each member is split into blocks.
+        index_path : str, optional
+            Path to the index of the byte offsets of the data blocks when
+            cif_dir_path is a single large .cif file or a pack file built with
+            cif_index.pack_cif_files, by default "<file path>.index.json". The
+            index is built with a single scan of the file the first time and
+            reused until the file changes. Each block is read through mmap and
+            its file path is named "<file path>/<ID>.cif".
+        cif_ids : list[str], optional
+            IDs of the structures to load from a pack file, by default all.
+        use_journal : bool, optional
+            Option to record the content hash, preprocessing outcome and cifkit
+            version of each file in a journal saved in the folder, by default
+            True. Files that were clean in an earlier run with the same cifkit
+            version and are unchanged since are not preprocessed again.
+        n_workers : int, optional
+            Number of processes used to preprocess and validate files, by
+            default 1. Set to None to use all CPUs. Ill-formatted files are
+            moved in the same order as in a sequential run.
+        quiet : bool, optional
+            Option to print only the summary of the preprocessing instead of a
+            line per file, by default False.
+        move_error_files : bool, optional
+            Option to move ill-formatted files into a sub-folder per error
+            category, by default True. If False, the files are left in place,
+            recorded in error_manifest and skipped.
 
         Attributes
         ----------
         dir_path: str
-            The path to the folder containing .cif files
+            The path to the folder containing .cif files, or to the archive or
+            pack file
         file_paths: list[str]
             The pist of file paths to .cif files
-        cifs: list[Cif]
-            The list of Cif objects
+        cifs: list[Cif] | list[CifHeader]
+            The list of Cif objects, or of CifHeader records if metadata_only
         file_count: int
             The number of .cif files in the folder
         logging_enabled: bool
             The option to log while pre-processing Cif objects
+        error_manifest: dict[str, str]
+            The error category, e.g., "error_duplicate_labels", of each
+            structure that could not be loaded without moving its file
         """
 
         # Process each file, handling exceptions that may occur
         self.logging_enabled = logging_enabled
-        file_paths = get_file_paths(cif_dir_path, add_nested_files=add_nested_files)
         self.dir_path = cif_dir_path
+        self.error_manifest = {}
+        self._cif_by_id = None
+
+        if os.path.isfile(cif_dir_path) and not is_archive(cif_dir_path):
+            print(f"Initializing structures from {cif_dir_path}...")
+            with CifPack(cif_dir_path, index_path) as pack:
+                self._init_from_contents(
+                    (
+                        (pack.get_file_path(cif_id), pack.get_content(cif_id))
+                        for cif_id in (pack.ids if cif_ids is None else cif_ids)
+                    ),
+                    preprocess,
+                    supercell_size,
+                    compute_CN,
+                    metadata_only,
+                )
+            return
+
+        if is_archive(cif_dir_path):
+            print(f"Initializing structures from {cif_dir_path}...")
+            sources = iter_archive_members(cif_dir_path)
+            if multi_block:
+                sources = (
+                    block
+                    for file_path, content in sources
+                    for block in iter_cif_blocks_from_content(content, file_path)
+                )
+            self._init_from_contents(
+                sources, preprocess, supercell_size, compute_CN, metadata_only
+            )
+            return
+
+        file_paths = get_file_paths(cif_dir_path, add_nested_files=add_nested_files)
+        if multi_block:
+            print(f"Initializing structures from {len(file_paths)} multi-block files...")
+            self._init_from_contents(
+                (
+                    (get_block_file_path(file_path, block_name), content)
+                    for file_path in file_paths
+                    for block_name, content in iter_cif_blocks(file_path)
+                ),
+                preprocess,
+                supercell_size,
+                compute_CN,
+                metadata_only,
+            )
+            return
 
         if preprocess:
             self._log_info(CifEnsembleLog.PREPROCESSING.value)
-            for file_path in file_paths:
-                edit_cif_file_based_on_db(file_path)
+            journal = PreprocessingJournal(cif_dir_path) if use_journal else None
+            if journal is not None:
+                file_paths = journal.get_pending_file_paths(file_paths)
+            edit_cif_files_based_on_db(file_paths, n_workers=n_workers)
             # Move ill-formatted files after pre-processing
-            move_files_based_on_errors(cif_dir_path, file_paths)
+            error_types = move_files_based_on_errors(
+                cif_dir_path,
+                file_paths,
+                n_workers=n_workers,
+                quiet=quiet,
+                manifest_only=not move_error_files,
+            )
+            if not move_error_files:
+                self.error_manifest.update(error_types)
+            if journal is not None:
+                journal.record_outcomes(file_paths, error_types)
+                journal.save()
 
         # Initialize new files after ill-formatted files are moved
-        self.file_paths = get_file_paths(cif_dir_path, add_nested_files=add_nested_files)
+        self.file_paths = [
+            file_path
+            for file_path in get_file_paths(
+                cif_dir_path, add_nested_files=add_nested_files
+            )
+            if file_path not in self.error_manifest
+        ]
         self.file_count = len(self.file_paths)
+        if metadata_only:
+            print(f"Scanning {self.file_count} .cif file headers...")
+            self.cifs = scan_cif_files(self.file_paths)
+            print("Finished scanning!")
+            return
+
         print(f"Initializing {self.file_count} Cif objects...")
 
         if logging_enabled:
@@ -98,6 +238,70 @@ class CifEnsemble:
             ]
         print("Finished initialization!")
 
+    def _init_from_contents(
+        self, sources, preprocess, supercell_size, compute_CN, metadata_only
+    ) -> None:
+        """Set the Cif objects and file paths from (file path, content)
+        pairs."""
+        self.cifs = self._load_from_contents(
+            sources, preprocess, supercell_size, compute_CN, metadata_only
+        )
+        self.file_paths = [cif.file_path for cif in self.cifs]
+        self.file_count = len(self.file_paths)
+        print("Finished initialization!")
+
+    def _load_from_contents(
+        self, sources, preprocess, supercell_size, compute_CN, metadata_only
+    ) -> list:
+        """Initialize Cif objects, or CifHeader records if metadata_only,
+        from (file path, content) pairs.
+
+        Nothing is written to disk. The error category of each structure
+        that fails to load is recorded in error_manifest.
+        """
+        cifs = []
+        for file_path, content in sources:
+            try:
+                if metadata_only:
+                    cif = scan_cif_header(decode_cif_content(content), file_path)
+                else:
+                    cif = Cif(
+                        file_path,
+                        is_formatted=not preprocess,
+                        logging_enabled=self.logging_enabled,
+                        supercell_size=supercell_size,
+                        compute_CN=compute_CN,
+                        content=content,
+                    )
+            except Exception as e:
+                self.error_manifest[file_path] = get_error_type(str(e))
+                continue
+            cifs.append(cif)
+        return cifs
+
+    def get_cif(self, cif_id: str):
+        """Return the Cif object, or CifHeader record, by its ID, which is
+        the file name without the .cif extension, e.g., the block name for
+        multi-block and pack files.
+
+        Raises
+        ------
+        KeyError
+            If no structure with the ID has been loaded.
+        """
+        if self._cif_by_id is None:
+            self._cif_by_id = {
+                os.path.splitext(cif.file_name)[0]: cif for cif in self.cifs
+            }
+        return self._cif_by_id[cif_id]
+
+    def release_geometry(self) -> None:
+        """Release the supercell and the points for plotting of each Cif
+        object, which are generated again on access."""
+        for cif in self.cifs:
+            if isinstance(cif, Cif):
+                cif.release_geometry()
+
     def _log_info(self, message):
         """Log a formatted message if logging is enabled."""
         if self.logging_enabled:
@@ -300,7 +504,7 @@ class CifEnsemble:
 
     @property
     def supercell_size_stats(self) -> dict[int, int]:
-        return self._attribute_stats("supercell_points", len)
+        return self._attribute_stats("supercell_atom_count")
 
     @property
     def unique_CN_values_by_min_dist_method_stat(
@@ -351,8 +555,9 @@ class CifEnsemble:
     def _filter_contains_any(self, property_name: str, values: list) -> set[str]:
         cif_file_paths = set()
         for cif in self.cifs:
+            if property_name.startswith("CN_"):
+                cif.compute_CN()
             property_value: str = getattr(cif, property_name)
-            cif.compute_CN()
             if any(val in property_value for val in values):
                 cif_file_paths.add(cif.file_path)
         return cif_file_paths
@@ -360,8 +565,9 @@ class CifEnsemble:
     def _filter_exact_match(self, property_name: str, values: list) -> set[str]:
         cif_file_paths = set()
         for cif in self.cifs:
+            if property_name.startswith("CN_"):
+                cif.compute_CN()
             property_value: str = getattr(cif, property_name)
-            cif.compute_CN()
             if property_value == set(values):
                 cif_file_paths.add(cif.file_path)
         return cif_file_paths
@@ -1,3 +1,5 @@
+import numpy as np
+
 from cifkit.utils.error_messages import OccupancyError
 
 
@@ -9,24 +11,61 @@ def frac_coordinates(atom_site_info: dict, label: str) -> tuple[str, str, str]:
     return (x_frac, y_frac, z_frac)
 
 
-def compute_coord_occupancy_sum(
-    site_labels: list[str], atom_site_info: dict
+def get_occupancies_and_coordinates(
+    site_labels: list[str], atom_site_info: dict | np.ndarray
+) -> tuple[dict[str, float], dict[str, tuple[float, float, float]]]:
+    """Return the occupancy and fractional coordinates of each label from
+    the atom site dictionary or from the structured array of
+    `cif_parser.get_atom_site_table`, whose label_index fields refer to
+    `site_labels`."""
+    if isinstance(atom_site_info, np.ndarray):
+        labels = [site_labels[i] for i in atom_site_info["label_index"].tolist()]
+        occupancies = dict(zip(labels, atom_site_info["occupancy"].tolist()))
+        coordinates = zip(
+            atom_site_info["x"].tolist(),
+            atom_site_info["y"].tolist(),
+            atom_site_info["z"].tolist(),
+        )
+        return occupancies, dict(zip(labels, coordinates))
+
+    occupancies = {
+        label: atom_site_info[label]["site_occupancy"] for label in site_labels
+    }
+    coordinates = {
+        label: frac_coordinates(atom_site_info, label) for label in site_labels
+    }
+    return occupancies, coordinates
+
+
+def _sum_occupancy_per_coordinate(
+    site_labels: list[str],
+    occupancies: dict[str, float],
+    coordinates: dict[str, tuple[float, float, float]],
 ) -> dict[tuple[str, str, str], float]:
-    """Compute sum of occupancy per each coordinate."""
+    """Sum the occupancies of the labels sharing each coordinate."""
     coord_occupancy_sum: dict[tuple[str, str, str], float] = {}
     for label in site_labels:
-        occupancy = round(
-            atom_site_info[label]["site_occupancy"], 6
-        )  # Round occupancy to 6 decimal places
-        coordinates = frac_coordinates(atom_site_info, label)
+        occupancy = round(occupancies[label], 6)  # Round occupancy to 6 decimal places
         # Calculate the sum and round it
-        current_sum = coord_occupancy_sum.get(coordinates, 0) + occupancy
-        coord_occupancy_sum[coordinates] = round(current_sum, 6)
+        current_sum = coord_occupancy_sum.get(coordinates[label], 0) + occupancy
+        coord_occupancy_sum[coordinates[label]] = round(current_sum, 6)
 
     return coord_occupancy_sum
 
 
-def get_site_mixing_type(site_labels: list[str], atom_site_info: dict) -> str:
+def compute_coord_occupancy_sum(
+    site_labels: list[str], atom_site_info: dict | np.ndarray
+) -> dict[tuple[str, str, str], float]:
+    """Compute sum of occupancy per each coordinate."""
+    occupancies, coordinates = get_occupancies_and_coordinates(
+        site_labels, atom_site_info
+    )
+    return _sum_occupancy_per_coordinate(site_labels, occupancies, coordinates)
+
+
+def get_site_mixing_type(
+    site_labels: list[str], atom_site_info: dict | np.ndarray
+) -> str:
     """Get file-level atomic site mixing info."""
 
     is_full_occupancy = True
@@ -57,20 +96,25 @@ def get_site_mixing_type(site_labels: list[str], atom_site_info: dict) -> str:
 
 
 def get_mixing_type_per_pair_dict(
-    site_labels: list[str], label_pairs: list[str], atom_site_info: dict
+    site_labels: list[str], label_pairs: list[str], atom_site_info: dict | np.ndarray
 ):
     """Return a dictionary, alphabetically sorted pair."""
-    coord_occupancy_sum = compute_coord_occupancy_sum(site_labels, atom_site_info)
+    occupancies, coordinates = get_occupancies_and_coordinates(
+        site_labels, atom_site_info
+    )
+    coord_occupancy_sum = _sum_occupancy_per_coordinate(
+        site_labels, occupancies, coordinates
+    )
 
     # Store categorizy per pair
     atom_site_pair_dict = {}
     for pair in label_pairs:
         first_label = pair[0]
         second_label = pair[1]
-        first_label_coord = frac_coordinates(atom_site_info, first_label)
-        second_label_coord = frac_coordinates(atom_site_info, second_label)
-        first_label_occ = atom_site_info[first_label]["site_occupancy"]
-        second_label_occ = atom_site_info[second_label]["site_occupancy"]
+        first_label_coord = coordinates[first_label]
+        second_label_coord = coordinates[second_label]
+        first_label_occ = occupancies[first_label]
+        second_label_occ = occupancies[second_label]
         # Step 1. "full_occupancy"
         if first_label_occ == 1 and second_label_occ == 1:
             atom_site_pair_dict[pair] = "full_occupancy"
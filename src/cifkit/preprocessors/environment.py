@@ -1,6 +1,22 @@
+from itertools import chain
+
 import numpy as np
+from scipy.spatial import cKDTree
+
+from cifkit.preprocessors.supercell_util import get_shifts, get_supercell_extents
+from cifkit.utils.lattice import Lattice
+
+# Methods to find the neighbors of each site
+NEIGHBOR_SEARCH_METHODS = ("brute", "kdtree", "cell_list", "periodic")
+
+# Strategies to choose the point of each site whose connections are kept
+SITE_STRATEGIES = ("most_connected", "representative")
+
+# Number of points whose cell list candidates are gathered at once
+CELL_LIST_CHUNK_SIZE = 512
 
-from cifkit.utils import unit
+# Number of translated points queried at once by the periodic search
+PERIODIC_QUERY_SIZE = 65536
 
 
 def get_site_connections(
@@ -8,96 +24,413 @@ def get_site_connections(
     unitcell_points,
     supercell_points,
     cutoff_radius: float,
+    lattice: Lattice = None,
+    neighbor_search: str = None,
+    site_strategy: str = "most_connected",
 ) -> dict:
-    """Compute all pair distances per site label."""
+    """Compute all pair distances per site label.
+
+    The neighbors of all points are searched once for all site labels,
+    using the lattice of the unit cell if provided. With
+    `neighbor_search="periodic"`, they are found from the unit cell and
+    lattice translations without a supercell, so `supercell_points` can be
+    None. The other methods search the supercell: "kdtree" queries one KD-tree
+    of it for all points, "cell_list" bins it into cubes the size of the
+    cutoff radius and compares each point with the 27 adjacent bins, and
+    "brute" computes the distances to every supercell point. All methods
+    give identical connections for the same supercell. By default,
+    "kdtree" searches the given supercell, and "periodic" is used only
+    if `supercell_points` is None.
+
+    With `site_strategy="most_connected"`, the distances of every point of
+    a site are computed and the point returned by
+    `get_most_connected_point_per_site` is kept. With "representative",
+    only the distances of the first point of each site are computed since
+    symmetry-equivalent points have the same neighbors. It is the atom
+    site wrapped into the unit cell if the first symmetry operation is
+    the identity.
+    """
+    if site_strategy not in SITE_STRATEGIES:
+        raise ValueError(
+            f"Site strategy must be one of {SITE_STRATEGIES}, not '{site_strategy}'."
+        )
+    if neighbor_search is None:
+        neighbor_search = "periodic" if supercell_points is None else "kdtree"
     labels, lengths, angles = parsed_data
+    if lattice is None:
+        lattice = Lattice(lengths, angles)
+
+    unitcell_coords, unitcell_labels = get_points_coords_and_labels(unitcell_points)
+    # Points whose distances are computed
+    site_point_indices = np.arange(len(unitcell_coords))
+    if site_strategy == "representative":
+        _, site_point_indices = np.unique(unitcell_labels, return_index=True)
+        site_point_indices.sort()
+    point_labels = unitcell_labels[site_point_indices]
+    points_cart = lattice.get_cartesian_coords(unitcell_coords[site_point_indices])
+    if neighbor_search == "periodic":
+        (
+            supercell_coords_cart,
+            supercell_labels,
+            candidate_indices,
+        ) = get_periodic_neighbor_candidates(
+            points_cart, unitcell_coords, unitcell_labels, cutoff_radius, lattice
+        )
+    else:
+        supercell_coords, supercell_labels = get_points_coords_and_labels(
+            supercell_points
+        )
+        supercell_coords_cart = lattice.get_cartesian_coords(supercell_coords)
+        candidate_indices = get_neighbor_candidates(
+            points_cart, supercell_coords_cart, cutoff_radius, neighbor_search
+        )
 
     all_labels_connections = {}
     for site_label in labels:
-        filtered_unitcell_points = [
-            point for point in unitcell_points if point[3] == site_label
-        ]
-
-        dist_result = get_nearest_dists_per_site(
-            filtered_unitcell_points,
-            supercell_points,
+        is_site_point = point_labels == site_label
+        dist_result = get_nearest_dists_per_point(
+            points_cart[is_site_point],
+            supercell_coords_cart,
+            supercell_labels,
             cutoff_radius,
-            lengths,
-            angles,
+            _select_candidates(candidate_indices, is_site_point),
         )
 
         dist_dict, dist_set = dist_result
 
-        (
-            label,
-            connections,
-        ) = get_most_connected_point_per_site(site_label, dist_dict, dist_set)
+        if site_strategy == "representative":
+            label = site_label
+            connections = sorted(dist_dict.get(0, []), key=lambda x: x[1])
+        else:
+            (
+                label,
+                connections,
+            ) = get_most_connected_point_per_site(site_label, dist_dict, dist_set)
 
         all_labels_connections[label] = connections
     return remove_duplicate_connections(all_labels_connections)
 
 
+def get_points_coords_and_labels(points) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (N, 3) fractional coordinates and the site labels of
+    points given as `CellPoints` or (x, y, z, label) tuples."""
+    if hasattr(points, "site_indices"):
+        labels = np.array(points.site_labels)[points.site_indices]
+        return np.asarray(points.coords, dtype=np.float64).reshape(-1, 3), labels
+    coords = np.array([point[:3] for point in points], dtype=np.float64)
+    labels = np.array([point[3] for point in points], dtype=str)
+    return coords.reshape(-1, 3), labels
+
+
+def get_neighbor_candidates(
+    points_cart: np.ndarray,
+    supercell_points_cart: np.ndarray,
+    cutoff_radius: float,
+    method: str = "brute",
+) -> list[np.ndarray] | None:
+    """Return the sorted indices of the supercell points that can be
+    within the cutoff radius of each point, or None if every supercell
+    point has to be compared with the "brute" method.
+
+    The candidates are searched slightly beyond the cutoff radius since
+    the distances are compared with it after rounding to 3 decimals.
+    """
+    if method == "brute":
+        return None
+    if method == "kdtree":
+        return get_kdtree_neighbor_candidates(
+            points_cart, supercell_points_cart, cutoff_radius + 1e-3
+        )
+    if method == "cell_list":
+        return get_cell_list_neighbor_candidates(
+            points_cart, supercell_points_cart, cutoff_radius + 1e-3
+        )
+    raise ValueError(
+        f"Neighbor search must be one of {NEIGHBOR_SEARCH_METHODS}, not '{method}'."
+    )
+
+
+def get_kdtree_neighbor_candidates(
+    points_cart: np.ndarray, supercell_points_cart: np.ndarray, radius: float
+) -> list[np.ndarray]:
+    """Return the sorted indices of the supercell points within the radius
+    of each point, from one KD-tree queried for all points at once."""
+    if len(points_cart) == 0 or len(supercell_points_cart) == 0:
+        return [np.empty(0, dtype=np.intp) for _ in range(len(points_cart))]
+    tree = cKDTree(supercell_points_cart)
+    neighbor_lists = tree.query_ball_point(points_cart, radius, return_sorted=True)
+    return [np.asarray(indices, dtype=np.intp) for indices in neighbor_lists]
+
+
+def get_cell_list_neighbor_candidates(
+    points_cart: np.ndarray,
+    supercell_points_cart: np.ndarray,
+    radius: float,
+    chunk_size: int = CELL_LIST_CHUNK_SIZE,
+) -> list[np.ndarray]:
+    """Return the sorted indices of the supercell points in the 27 bins
+    around each point, with the supercell binned into cubes of the radius.
+
+    Every supercell point within the radius of a point is in an adjacent
+    bin. The bins are found by sorting the points by bin, so memory grows
+    with the number of points rather than bins, and the candidates are
+    gathered for chunks of points at a time.
+    """
+    n_supercell = len(supercell_points_cart)
+    if len(points_cart) == 0 or n_supercell == 0:
+        return [np.empty(0, dtype=np.intp) for _ in range(len(points_cart))]
+
+    origin = supercell_points_cart.min(axis=0)
+    supercell_bins = np.floor((supercell_points_cart - origin) / radius).astype(np.int64)
+    grid_shape = supercell_bins.max(axis=0) + 1
+    bin_ids = np.ravel_multi_index(supercell_bins.T, grid_shape)
+    order = np.argsort(bin_ids, kind="stable")
+    sorted_bin_ids = bin_ids[order]
+
+    bin_offsets = np.stack(
+        np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing="ij"), axis=-1
+    ).reshape(-1, 3)
+    candidate_indices = []
+    for start in range(0, len(points_cart), chunk_size):
+        chunk = points_cart[start : start + chunk_size]
+        point_bins = np.floor((chunk - origin) / radius).astype(np.int64)
+        # (n_points, 27, 3) bins around each point
+        neighbor_bins = point_bins[:, None, :] + bin_offsets[None, :, :]
+        is_valid = np.all((neighbor_bins >= 0) & (neighbor_bins < grid_shape), axis=-1)
+        neighbor_bin_ids = np.ravel_multi_index(
+            np.where(is_valid[..., None], neighbor_bins, 0).transpose(2, 0, 1),
+            grid_shape,
+        )
+        starts = np.searchsorted(sorted_bin_ids, neighbor_bin_ids, side="left")
+        ends = np.searchsorted(sorted_bin_ids, neighbor_bin_ids, side="right")
+        counts = np.where(is_valid, ends - starts, 0).ravel()
+
+        # Gather the points of all bins, then sort them per point
+        total = counts.sum()
+        first = np.cumsum(counts) - counts
+        positions = np.repeat(starts.ravel() - first, counts) + np.arange(total)
+        counts_per_point = counts.reshape(len(chunk), -1).sum(axis=1)
+        point_ids = np.repeat(np.arange(len(chunk)), counts_per_point)
+        keys = np.sort(point_ids * n_supercell + order[positions])
+        split_at = np.cumsum(counts_per_point)[:-1]
+        candidate_indices.extend(np.split(keys % n_supercell, split_at))
+    return candidate_indices
+
+
+def _select_candidates(candidate_indices, mask: np.ndarray):
+    """Return the candidates of the points selected by the mask."""
+    if candidate_indices is None:
+        return None
+    return [candidate_indices[i] for i in np.flatnonzero(mask)]
+
+
 def get_nearest_dists_per_site(
     filtered_unitcell_points,
     supercell_points,
     cutoff_radius: float,
     lengths,
     angles_rad,
+    lattice: Lattice = None,
+    neighbor_search: str = "kdtree",
+):
+    """Compute the distances from each point of a site to the supercell
+    points within the cutoff radius."""
+    if lattice is None:
+        lattice = Lattice(lengths, angles_rad)
+    unitcell_coords, _ = get_points_coords_and_labels(filtered_unitcell_points)
+    supercell_coords, supercell_labels = get_points_coords_and_labels(supercell_points)
+    unitcell_coords_cart = lattice.get_cartesian_coords(unitcell_coords)
+    supercell_coords_cart = lattice.get_cartesian_coords(supercell_coords)
+    return get_nearest_dists_per_point(
+        unitcell_coords_cart,
+        supercell_coords_cart,
+        supercell_labels,
+        cutoff_radius,
+        get_neighbor_candidates(
+            unitcell_coords_cart, supercell_coords_cart, cutoff_radius, neighbor_search
+        ),
+    )
+
+
+def get_nearest_dists_per_point(
+    points_cart: np.ndarray,
+    supercell_points_cart: np.ndarray,
+    supercell_labels: np.ndarray,
+    cutoff_radius: float,
+    candidate_indices: list[np.ndarray] = None,
 ):
+    """Compute the distances from each Cartesian point to the Cartesian
+    supercell points, rounded to 3 decimals, that are between 0.1 and the
+    cutoff radius.
+
+    If given, only the candidate supercell points of each point from
+    `get_neighbor_candidates` are compared.
+    """
     # Initialize a dictionary to store the relationships
     dist_dict = {}
     dist_set = set()
-    # convert to cartesian
-    filtered_unitcell_points_cart = []
-    for x, y, z, label in filtered_unitcell_points:
-        cx, cy, cz = unit.fractional_to_cartesian(
-            [x, y, z],
-            lengths,
-            angles_rad,
-        )
-        filtered_unitcell_points_cart.append((cx, cy, cz, label))
-
-    supercell_points_cart = []
-    supercell_points_cart_labels = []
-    for x, y, z, label in supercell_points:
-        cx, cy, cz = unit.fractional_to_cartesian(
-            [x, y, z],
-            lengths,
-            angles_rad,
-        )
-        supercell_points_cart.append((cx, cy, cz))
-        supercell_points_cart_labels.append(label)
-    supercell_points_cart = np.array(supercell_points_cart, dtype=np.float64)
-    supercell_points_cart_labels = np.array(supercell_points_cart_labels)
+    points_cart_rounded = np.round(points_cart, 3).tolist()
 
     # Loop through each point in the filtered list
-    for i, point_1 in enumerate(filtered_unitcell_points_cart):
-        dist = np.linalg.norm(supercell_points_cart - np.array(point_1[:3]), axis=1)
+    for i, point_1 in enumerate(points_cart):
+        if candidate_indices is None:
+            dist = np.linalg.norm(supercell_points_cart - point_1, axis=1)
+        else:
+            candidates = candidate_indices[i]
+            dist = np.linalg.norm(supercell_points_cart[candidates] - point_1, axis=1)
         dist = np.round(dist, 3)
-        selected_indices = np.where(np.logical_and(dist < cutoff_radius, dist > 0.1))[0]
+        is_selected = np.logical_and(dist < cutoff_radius, dist > 0.1)
+        selected_dists = dist[is_selected].tolist()
+        selected_indices = np.flatnonzero(is_selected)
+        if candidate_indices is not None:
+            selected_indices = candidates[selected_indices]
+        selected_coords = np.round(supercell_points_cart[selected_indices], 3).tolist()
+        selected_labels = supercell_labels[selected_indices].tolist()
         point_2_info = [
-            (
-                str(supercell_points_cart_labels[index]),
-                float(dist[index]),
-                [
-                    float(np.round(point_1[0], 3)),
-                    float(np.round(point_1[1], 3)),
-                    float(np.round(point_1[2], 3)),
-                ],
-                [
-                    float(np.round(supercell_points_cart[index][0], 3)),
-                    float(np.round(supercell_points_cart[index][1], 3)),
-                    float(np.round(supercell_points_cart[index][2], 3)),
-                ],
+            (str(label), dist_2, list(points_cart_rounded[i]), coords_2)
+            for label, dist_2, coords_2 in zip(
+                selected_labels, selected_dists, selected_coords
             )
-            for index in selected_indices
         ]
-        dist_set.update(dist[selected_indices].tolist())
+        dist_set.update(selected_dists)
         if point_2_info:
             dist_dict[i] = point_2_info
     return dist_dict, dist_set
 
 
+def get_periodic_nearest_dists_per_point(
+    points_cart: np.ndarray,
+    unitcell_coords: np.ndarray,
+    unitcell_labels: np.ndarray,
+    cutoff_radius: float,
+    lattice: Lattice,
+):
+    """Compute the same distances as `get_nearest_dists_per_point` with
+    the supercell of `get_supercell_extents`, from the unit cell points
+    translated by the lattice vectors instead of a supercell."""
+    images_cart, image_labels, candidate_indices = get_periodic_neighbor_candidates(
+        points_cart, unitcell_coords, unitcell_labels, cutoff_radius, lattice
+    )
+    return get_nearest_dists_per_point(
+        points_cart, images_cart, image_labels, cutoff_radius, candidate_indices
+    )
+
+
+def get_periodic_neighbor_candidates(
+    points_cart: np.ndarray,
+    unitcell_coords: np.ndarray,
+    unitcell_labels: np.ndarray,
+    cutoff_radius: float,
+    lattice: Lattice,
+    query_size: int = PERIODIC_QUERY_SIZE,
+) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+    """Return the Cartesian coordinates and labels of the unit cell points
+    translated by lattice vectors that can be within the cutoff radius of
+    the points, and the sorted indices of the candidates of each point.
+
+    A KD-tree of the unit cell is queried around each point minus each
+    lattice translation that can be within the cutoff radius, which is
+    bounded by the interplanar spacings for any cell shape. The queries
+    are made for chunks of points at a time. Only the translated points
+    found are built, in the order and with the same rounding and
+    duplicate removal as the supercell of `get_supercell_extents`.
+    """
+    if len(points_cart) == 0 or len(unitcell_coords) == 0:
+        return (
+            np.empty((0, 3)),
+            unitcell_labels[:0],
+            [np.empty(0, dtype=np.intp) for _ in range(len(points_cart))],
+        )
+    extents = get_supercell_extents(cutoff_radius, lattice.lengths, lattice.angles_rad)
+    shifts = np.array(get_shifts(extents), dtype=float)
+    shifts_cart = lattice.get_cartesian_coords(shifts)
+    n_shifts = len(shifts)
+    duplicate_offsets = get_duplicate_image_offsets(unitcell_coords, unitcell_labels)
+    tree = cKDTree(lattice.get_cartesian_coords(unitcell_coords))
+    # Also covers the rounding of the translated points to 5 decimals
+    radius = cutoff_radius + 2e-3
+
+    # Index in the supercell of the translated points near each point
+    point_image_ids = []
+    chunk_size = max(1, query_size // n_shifts)
+    for start in range(0, len(points_cart), chunk_size):
+        chunk = points_cart[start : start + chunk_size]
+        query_points = (chunk[:, None, :] - shifts_cart[None, :, :]).reshape(-1, 3)
+        neighbor_lists = tree.query_ball_point(query_points, radius)
+        counts = np.fromiter(map(len, neighbor_lists), np.intp, len(neighbor_lists))
+        unit_indices = np.fromiter(
+            chain.from_iterable(neighbor_lists), np.intp, counts.sum()
+        )
+        query_ids = np.repeat(np.arange(len(query_points)), counts)
+        point_ids, shift_ids = np.divmod(query_ids, n_shifts)
+
+        is_kept = ~_is_duplicate_image(
+            unit_indices, shifts[shift_ids], duplicate_offsets, extents
+        )
+        point_ids = point_ids[is_kept]
+        image_ids = unit_indices[is_kept] * n_shifts + shift_ids[is_kept]
+        order = np.lexsort((image_ids, point_ids))
+        split_at = np.cumsum(np.bincount(point_ids, minlength=len(chunk)))[:-1]
+        point_image_ids.extend(np.split(image_ids[order], split_at))
+
+    unique_image_ids = np.unique(np.concatenate(point_image_ids))
+    image_unit_indices, image_shift_ids = np.divmod(unique_image_ids, n_shifts)
+    image_coords = np.round(
+        unitcell_coords[image_unit_indices] + shifts[image_shift_ids], 5
+    )
+    candidate_indices = [
+        np.searchsorted(unique_image_ids, image_ids) for image_ids in point_image_ids
+    ]
+    return (
+        lattice.get_cartesian_coords(image_coords),
+        unitcell_labels[image_unit_indices],
+        candidate_indices,
+    )
+
+
+def get_duplicate_image_offsets(
+    unitcell_coords: np.ndarray, unitcell_labels: np.ndarray
+) -> dict[int, np.ndarray]:
+    """Return, for each unit cell point equal to an earlier point of the
+    same label translated by a lattice vector, e.g., at 1.0 and 0.0, the
+    (n, 3) lattice vectors from the earlier points to it.
+
+    A translated point coinciding with a translated earlier point is
+    removed from the supercell, see `get_unique_point_indices`.
+    """
+    grid_coords = np.rint(unitcell_coords * 1e5).astype(np.int64)
+    first_indices = {}
+    offsets = {}
+    labels = unitcell_labels.tolist()
+    for index, (label, grid_coord) in enumerate(zip(labels, grid_coords)):
+        key = (label, *np.mod(grid_coord, 100000).tolist())
+        for first_index in first_indices.setdefault(key, []):
+            offsets.setdefault(index, []).append(
+                (grid_coord - grid_coords[first_index]) // 100000
+            )
+        first_indices[key].append(index)
+    return {index: np.array(vectors) for index, vectors in offsets.items()}
+
+
+def _is_duplicate_image(
+    unit_indices: np.ndarray,
+    shifts: np.ndarray,
+    duplicate_offsets: dict[int, np.ndarray],
+    extents: tuple[int, int, int],
+) -> np.ndarray:
+    """Return whether each unit cell point translated by the shift is
+    also an earlier unit cell point translated within the extents."""
+    is_duplicate = np.zeros(len(unit_indices), dtype=bool)
+    for unit_index, offsets in duplicate_offsets.items():
+        is_unit_point = unit_indices == unit_index
+        for offset in offsets:
+            earlier_shifts = shifts[is_unit_point] + offset
+            is_duplicate[is_unit_point] |= np.all(
+                np.abs(earlier_shifts) <= np.array(extents), axis=1
+            )
+    return is_duplicate
+
+
 def get_most_connected_point_per_site(label: str, dist_dict: dict, dist_set: set):
     """Identify the reference point with the highest number of
     connections within the 50 shortest distances from a set of
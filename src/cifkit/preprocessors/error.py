@@ -1,12 +1,23 @@
 import os
 from pathlib import Path
 
-from cifkit.models.cif import Cif
-from cifkit.preprocessors.format import preprocess_label_element_loop_values
-from cifkit.utils.cif_parser import check_unique_atom_site_labels
+from cifkit.preprocessors.validator import validate_cif_file
+from cifkit.utils.parallel import map_in_processes
 
 
-def move_files_based_on_errors(cif_dir_path, file_paths):
+def move_files_based_on_errors(
+    cif_dir_path, file_paths, n_workers=1, quiet=False, manifest_only=False
+) -> dict[str, str]:
+    """Move ill-formatted .cif files into a sub-folder per error category
+    and return the error category of each moved file keyed by its
+    original path.
+
+    Files are validated across `n_workers` processes, or all CPUs if
+    None, and moved in the order of `file_paths`. Set `quiet` to True to
+    only print the summary instead of a line per file. Set
+    `manifest_only` to True to leave the files in place and only return
+    the manifest of error categories.
+    """
     print(f"\nCIF Preprocessing in {cif_dir_path} begun...\n")
 
     # Ensure dir_path is a Path object
@@ -25,48 +36,70 @@ def move_files_based_on_errors(cif_dir_path, file_paths):
 
     # Ensure all direct
     num_files_moved = {key: 0 for key in error_directories.keys()}
+    error_types = {}
 
-    for i, file_path in enumerate(file_paths, start=1):
+    errors = map_in_processes(get_file_error, file_paths, n_workers=n_workers)
+    for i, (file_path, error) in enumerate(zip(file_paths, errors), start=1):
         filename = os.path.basename(file_path)
-        print(f"Preprocessing {file_path} ({i}/{len(file_paths)})")
-        try:
-            # Attempt to initialize a Cif object and if it is PCD source,
-            # preprocess the CIF file and identify the error type
-            cif = Cif(file_path, is_formatted=True)
-            db_source = cif.db_source
-            if db_source == "PCD":
-                # Preprocess the CIF file
-                preprocess_label_element_loop_values(file_path)
-            # Check site element can be parsed from site label
-            check_unique_atom_site_labels(file_path)
-
-        except Exception as e:
-            error_message = str(e)
-            # Example of handling specific errors, adjust as needed
-            if "symmetry operation" in error_message:
-                error_type = "error_operations"
-            elif "no atomic label and type" in error_message:
-                error_type = "error_no_labels"
-            elif "contains duplicate atom site labels" in error_message:
-                error_type = "error_duplicate_labels"
-            elif "Wrong number of values in loop" in error_message:
-                error_type = "error_wrong_loop_value"
-            elif "missing atomic coordinates" in error_message:
-                error_type = "error_coords"
-            elif "element was not correctly parsed" in error_message:
-                error_type = "error_invalid_label"
-            else:
-                error_type = "error_others"
+        if not quiet:
+            print(f"Preprocessing {file_path} ({i}/{len(file_paths)})")
+        if error is None:
+            continue
 
+        error_type, error_message = error
+        if not manifest_only:
             _make_directory_and_move(file_path, error_directories[error_type], filename)
-            num_files_moved[error_type] += 1
-            print(f"File {filename} moved to '{error_type}' due to: {error_message}")
+        num_files_moved[error_type] += 1
+        error_types[file_path] = error_type
+        if not quiet:
+            action = "flagged as" if manifest_only else "moved to"
+            print(f"File {filename} {action} '{error_type}' due to: {error_message}")
 
     # Display the number of files moved to each folder
     print("\nSUMMARY")
     for error_type, count in num_files_moved.items():
-        print(f"# of files moved to '{error_type}' folder: {count}")
+        if manifest_only:
+            print(f"# of files flagged as '{error_type}': {count}")
+        else:
+            print(f"# of files moved to '{error_type}' folder: {count}")
     print()
+    return error_types
+
+
+def get_file_error(file_path: str) -> tuple[str, str] | None:
+    """Return the error category and message of a .cif file, or None if
+    it can be loaded.
+
+    Only the parse, label and symmetry checks are run, so no supercell
+    is generated. The site labels of a PCD file are preprocessed.
+    """
+    try:
+        validate_cif_file(file_path)
+
+    except Exception as e:
+        error_message = str(e)
+        return get_error_type(error_message), error_message
+
+    return None
+
+
+def get_error_type(error_message: str) -> str:
+    """Return the error category of a .cif file from the message of the
+    exception raised while loading it."""
+    if "symmetry operation" in error_message:
+        return "error_operations"
+    elif "no atomic label and type" in error_message:
+        return "error_no_labels"
+    elif "contains duplicate atom site labels" in error_message:
+        return "error_duplicate_labels"
+    elif "Wrong number of values in loop" in error_message:
+        return "error_wrong_loop_value"
+    elif "missing atomic coordinates" in error_message.lower():
+        return "error_coords"
+    elif "element was not correctly parsed" in error_message:
+        return "error_invalid_label"
+    else:
+        return "error_others"
 
 
 def _make_directory_and_move(file_path, dir_path, new_file_path):
@@ -1,222 +1,251 @@
+from typing import Callable, NamedTuple
+
 from cifkit.utils import cif_parser, string_parser
 
 
+class LabelRule(NamedTuple):
+    """Rule rewriting an atomic site label that matches a label shape.
+
+    `get_new_label` receives the site label, the atom type symbol and the
+    element parsed from the label, and returns the new label or None if
+    the rule does not apply.
+    """
+
+    name: str
+    # Only applied if the element parsed from the label is not the symbol
+    is_mismatch_only: bool
+    get_new_label: Callable[[str, str, str], str | None]
+
+
+def _has_same_first_two_characters(site_label: str, atom_type_symbol: str) -> bool:
+    return site_label[:2].lower() == atom_type_symbol.lower()
+
+
+# Rules keyed by label shape, where "A" is an alphabetic character, "D" a
+# digit, and "X" any other character, e.g., "M1A" -> "ADA". The rules of a
+# shape are applied in order after Type 8, which handles labels with a comma.
+LABEL_RULES: dict[str, list[LabelRule]] = {
+    # Type 1. Ex) 250165.cif, M1 Th -> ThM1 Th
+    "AD": [
+        LabelRule(
+            "type_1",
+            True,
+            lambda label, symbol, parsed: label.replace(parsed, symbol + label[-2]),
+        ),
+    ],
+    # Type 2. Ex) 312084.cif, M1A Ge -> Ge1A Ge
+    "ADA": [
+        LabelRule(
+            "type_2",
+            True,
+            lambda label, symbol, parsed: label.replace(parsed, symbol),
+        ),
+    ],
+    # Type 3. Ex) 1603834.cif, R Nd -> Nd Nd
+    "A": [
+        LabelRule(
+            "type_3",
+            True,
+            lambda label, symbol, parsed: label.replace(parsed, symbol),
+        ),
+    ],
+    # Type 4. Ex) 1711694.cif, Ln Gd -> Gd Gd
+    "AA": [
+        LabelRule(
+            "type_4",
+            True,
+            lambda label, symbol, parsed: (
+                symbol if label.lower() not in symbol.lower() else None
+            ),
+        ),
+    ],
+    "AAD": [
+        # Type 5. Ex) 1049941.cif, PR1 Pr -> Pr1 Pr
+        LabelRule(
+            "type_5",
+            True,
+            lambda label, symbol, parsed: (
+                label[0] + label[1].lower() + label[2]
+                if _has_same_first_two_characters(label, symbol)
+                else None
+            ),
+        ),
+        # Type 7. Ex) 1817279.cif, Fe2 Pt -> Pt2 Pt
+        LabelRule(
+            "type_7",
+            True,
+            lambda label, symbol, parsed: (
+                symbol + label[2]
+                if not _has_same_first_two_characters(label, symbol)
+                else None
+            ),
+        ),
+    ],
+    # Type 6. Ex) 381111.cif, NG1A Ni -> Ni1A Ni
+    "AADA": [
+        LabelRule(
+            "type_6",
+            True,
+            lambda label, symbol, parsed: (
+                symbol + label[2] + label[3]
+                if not _has_same_first_two_characters(label, symbol)
+                else None
+            ),
+        ),
+    ],
+    # Type 9. Ex) 1200981.cif, Snb Sn -> SnB Sn
+    "AAA": [
+        LabelRule(
+            "type_9",
+            False,
+            lambda label, symbol, parsed: label[0] + label[1] + label[2].upper(),
+        ),
+    ],
+}
+
+
+def get_label_shape(site_label: str) -> str:
+    """Return the shape of a site label used to look up its rules, e.g.,
+    "M1A" -> "ADA"."""
+    return "".join(
+        "A" if char.isalpha() else "D" if char.isdigit() else "X" for char in site_label
+    )
+
+
+def normalize_site_label_line(
+    line: str, get_unique_elements: Callable[[], list[str]]
+) -> tuple[str, list[str]]:
+    """Return an atom site loop line with the site label rewritten and
+    the names of the rules that fired.
+
+    `get_unique_elements` is only called for labels containing a comma.
+    """
+    line = line.strip()
+    try:
+        site_label, atom_type_symbol = line.split()[:2]
+    except ValueError:
+        raise ValueError("The file contains no atomic label and type.")
+    atom_type_from_label = string_parser.get_atom_type_from_label(site_label)
+    fired_rules = []
+
+    # Type 8. Ex) 1817279.cif, In1,Co3B Co -> Co13B Co
+    if "," in site_label:
+        site_label_original = site_label
+        # Get 'Er1In3B'
+        site_label = site_label.replace(",", "").split(" ")[0]
+
+        # Replace all elements in the label with ""
+        for element in get_unique_elements():
+            if element in site_label:
+                site_label = site_label.replace(element, "")
+
+        line = line.replace(site_label_original, atom_type_symbol + site_label)
+        fired_rules.append("type_8")
+
+    is_mismatch = atom_type_symbol != atom_type_from_label
+    for rule in LABEL_RULES.get(get_label_shape(site_label), []):
+        if rule.is_mismatch_only and not is_mismatch:
+            continue
+        new_label = rule.get_new_label(site_label, atom_type_symbol, atom_type_from_label)
+        if new_label is not None:
+            line = line.replace(site_label, new_label)
+            fired_rules.append(rule.name)
+
+    return line, fired_rules
+
+
+def normalize_site_labels_in_content(
+    content: str,
+) -> tuple[str, dict[str, list[str]]]:
+    """Return the text of a .cif file with the atomic site labels
+    rewritten in a single pass over the atom site loop lines, and the
+    names of the rules that fired per original site label.
+
+    The content is returned unchanged if no rule fired.
+    """
+    lines = cif_parser.get_lines_from_content(content)
+    start_index, end_index = cif_parser.get_start_end_line_indexes(
+        None, "_atom_site_occupancy", lines=lines
+    )
+    loop_lines = lines[start_index:end_index]
+
+    unique_elements = None
+
+    def get_unique_elements() -> list[str]:
+        # Longer elements first so that "Co" is removed before "C"
+        nonlocal unique_elements
+        if unique_elements is None:
+            tokens_per_line = [line.split() for line in loop_lines]
+            unique_elements = sorted(
+                {
+                    string_parser.strip_numbers_and_symbols(tokens[1])
+                    for tokens in tokens_per_line
+                    if len(tokens) > 1
+                },
+                key=lambda element: (-len(element), element),
+            )
+        return unique_elements
+
+    modified_lines = []
+    fired_rules_per_label = {}
+    for line in loop_lines:
+        modified_line, fired_rules = normalize_site_label_line(line, get_unique_elements)
+        modified_lines.append(modified_line + "\n")
+        if fired_rules:
+            fired_rules_per_label[line.split()[0]] = fired_rules
+
+    if not fired_rules_per_label:
+        return content, fired_rules_per_label
+
+    # Replace the atom site loop lines with the modified lines
+    lines[start_index:end_index] = modified_lines
+    return "".join(lines), fired_rules_per_label
+
+
+def preprocess_label_element_loop_values_in_content(content: str) -> str:
+    """Return the text of a .cif file with the atomic site labels
+    modified, without reading or writing any file.
+
+    See `preprocess_label_element_loop_values` for the handled cases.
+    """
+    return normalize_site_labels_in_content(content)[0]
+
+
 def preprocess_label_element_loop_values(file_path: str) -> None:
     """Modify the atomic label site text in a .cif file.
 
     .cif files may have the atomic labels in symbolic forms such as "M1"
     and some also have two elements provided such as "In1,Co3B". Each
-    case is handled with specific examples demonstrated in the source
-    and test code.
+    case is handled by the rules in LABEL_RULES with examples
+    demonstrated in the source and test code.
     """
-    is_cif_file_updated = False
-    cif_block = cif_parser.get_cif_block(file_path)
-    loop_values = cif_parser.get_loop_values(cif_block)
+    preprocess_label_element_loop_values_in_files([file_path])
 
-    # Get lines in _atom_site_occupancy only
-    modified_lines = []
-    content_lines = cif_parser.get_line_content_from_tag(
-        file_path, "_atom_site_occupancy"
-    )
-    # Check whether the content line is empty, then throw an error
-    for line in content_lines:
-        line = line.strip()
-        try:
-            site_label, atom_type_symbol = line.split()[:2]
-        except ValueError:
-            raise ValueError("The file contains no atomic label and type.")
-        atom_type_from_label = string_parser.get_atom_type_from_label(site_label)
-        unique_elements = cif_parser.get_unique_elements_from_loop(loop_values)
-        """Type 8. Ex) 1817279.cif.
-
-        In1,Co3B Co 4 c 0.75 0.25 0.59339 0.07(3)
-        ->
-        Co13B Co 4 c 0.75 0.25 0.59339 0.07(3)
-        """
-
-        # Check whether it has a comma
-        if "," in site_label:
-            site_label_original = site_label
-            # Get 'Er1In3B'
-            site_label = site_label.replace(",", "").split(" ")[0]
-
-            # Replace all elements in the label with ""
-            for element in unique_elements:
-                if element in site_label:
-                    site_label = site_label.replace(element, "")
-
-            # Combine stripped_site_label with element
-            modified_label = atom_type_symbol + site_label
-
-            line = line.replace(site_label_original, modified_label)
-            is_cif_file_updated = True
-
-        """
-        Type 9.
-        Ex) 1200981.cif
-        Snb Sn 4 c 0.0595 0.25 0.0952 1
-        ->
-        SnB Sn 4 c 0.0595 0.25 0.0952 1
-        """
-
-        # Check 3 letter, all of them are alphabets
-
-        if (
-            len(site_label) == 3
-            and site_label[0].isalpha()
-            and site_label[1].isalpha()
-            and site_label[2].isalpha()
-        ):
-            # Uppercase the last character
-            modified_label = site_label[0] + site_label[1] + site_label[2].upper()
-
-            # Modify the label
-            line = line.replace(site_label, modified_label)  # Modify the line
-            is_cif_file_updated = True
-
-        if atom_type_symbol != atom_type_from_label:
-            """Type 1. Ex) 250165.cif.
-
-            M1 Th 4 a 0 0 0 0.99
-            ->
-            ThM1 Th 4 a 0 0 0 0.99
-            """
-            if (
-                len(site_label) == 2
-                and site_label[-1].isdigit()
-                and site_label[-2].isalpha()
-            ):
-                # Get the new label Ex) M1 -> Ge1
-                new_label = site_label.replace(
-                    atom_type_from_label,
-                    (atom_type_symbol + site_label[-2]),
-                )
-                line = line.replace(site_label, new_label)  # Modify the line
-                is_cif_file_updated = True
-
-            """
-            Type 2.
-            Ex) 312084.cif
-            M1A Ge 8 h 0 0.06 0.163 0.500
-            ->
-            Ge1A Ge 8 h 0 0.06 0.163 0.50
-            """
-
-            if (
-                len(site_label) == 3
-                and site_label[-1].isalpha()
-                and site_label[-2].isdigit()
-                and site_label[-3].isalpha()
-            ):
-                new_label = site_label.replace(atom_type_from_label, atom_type_symbol)
-                line = line.replace(site_label, new_label)  # Modify the line
-                is_cif_file_updated = True
-
-            """
-            Type 3.
-            Ex) 1603834.cif
-            R Nd 2 a 0 0 0 1
-            ->
-            Nd Nd 2 a 0 0 0 1
-            """
-
-            if len(site_label) == 1 and site_label[-1].isalpha():
-                new_label = site_label.replace(atom_type_from_label, atom_type_symbol)
-                line = line.replace(site_label, new_label)
-                is_cif_file_updated = True
-
-            """
-            Type 4.
-            Ex) 1711694.cif
-            Ln Gd 2 a 0 0 0.0 1
-            ->
-            Gd Gd 2 a 0 0 0.0 1
-            """
-            if (
-                len(site_label) == 2
-                and site_label[-1].isalpha()
-                and site_label[-2].isalpha()
-            ):
-                if site_label.lower() not in atom_type_symbol.lower():
-                    # print(atom_type_label.lower(), atom_type_symbol.lower())
-                    # Do not use get_atom_type since replace the entire label
-                    new_label = site_label.replace(site_label, atom_type_symbol)
-                    line = line.replace(site_label, new_label)
-                    is_cif_file_updated = True
-
-            """
-            Type 5.
-            Ex) 1049941.cif
-            PR1 Pr 4 j 0.02076 0.5 0.30929 1
-            ->
-            Pr1 Pr 4 j 0.02076 0.5 0.30929 1
-            """
-
-            if (
-                len(site_label) == 3
-                and site_label[0].isalpha()
-                and site_label[1].isalpha()
-                and site_label[2].isdigit()
-            ):
-                first_two_label_characters = site_label[0] + site_label[1]
-                if first_two_label_characters.lower() == atom_type_symbol.lower():
-                    modified_label = site_label[0] + site_label[1].lower() + site_label[2]
-                    line = line.replace(site_label, modified_label)
-                    is_cif_file_updated = True
-
-            """
-            Type 6.
-
-            Ex) 1049941.cif
-            NG1A Ni 4 j 0 0.172 0.5 0.88(1)
-            ->
-            Ni1A Ni 4 j 0 0.172 0.5 0.88(1)
-            """
-            if (
-                len(site_label) == 4
-                and site_label[0].isalpha()
-                and site_label[1].isalpha()
-                and site_label[2].isdigit()
-                and site_label[3].isalpha()
-            ):
-                first_two_label_characters = site_label[0] + site_label[1]
-                if first_two_label_characters.lower() != atom_type_symbol.lower():
-                    modified_label = atom_type_symbol + site_label[2] + site_label[3]
-                    line = line.replace(site_label, modified_label)
-                    is_cif_file_updated = True
-
-            """
-            Type 7.
-            Ex) 1817279.cif
-            Fe2 Pt 1 d 0.5 0.5 0.5 0.01(4)
-            ->
-            Pt2 Pt 1 d 0.5 0.5 0.5 0.01(4)
-            """
-            if (
-                len(site_label) == 3
-                and site_label[0].isalpha()
-                and site_label[1].isalpha()
-                and site_label[2].isdigit()
-            ):
-                first_two_label_characters = site_label[0] + site_label[1]
-                if first_two_label_characters.lower() != atom_type_symbol.lower():
-                    modified_label = atom_type_symbol + site_label[2]
-                    line = line.replace(site_label, modified_label)
-                    is_cif_file_updated = True
-
-        modified_lines.append(line + "\n")
-
-    if is_cif_file_updated:
+
+def preprocess_label_element_loop_values_in_files(
+    file_paths: list[str],
+) -> dict[str, dict[str, list[str]]]:
+    """Modify the atomic site labels of .cif files and return the names
+    of the rules that fired per original site label for each file.
+
+    Files without any modified label are neither written nor reported.
+
+    Examples
+    --------
+    >>> preprocess_label_element_loop_values_in_files(["250165.cif"])
+    {"250165.cif": {"M1": ["type_1"]}}
+    """
+    fired_rules_per_file = {}
+    for file_path in file_paths:
         with open(file_path, "r") as f:
-            original_lines = f.readlines()
-
-        (
-            start_index,
-            end_index,
-        ) = cif_parser.get_start_end_line_indexes(file_path, "_atom_site_occupancy")
-        # Replace the specific section in original_lines with modified_lines
-        original_lines[start_index:end_index] = modified_lines
-
-        # Write the modified content back to the file
-        with open(file_path, "w") as f:
-            f.writelines(original_lines)
+            content = f.read()
+
+        modified_content, fired_rules = normalize_site_labels_in_content(content)
+        if fired_rules:
+            fired_rules_per_file[file_path] = fired_rules
+        if modified_content != content:
+            # Write the modified content back to the file
+            with open(file_path, "w") as f:
+                f.write(modified_content)
+
+    return fired_rules_per_file
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+
+from cifkit.version import __version__
+
+JOURNAL_FILE_NAME = ".cifkit_journal.json"
+CLEAN_OUTCOME = "clean"
+
+
+def get_file_hash(file_path: str) -> str:
+    """Return the SHA-256 hash of the content of a file."""
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class PreprocessingJournal:
+    """Journal of the preprocessing outcome of each .cif file in a
+    folder, saved as JSON in the folder.
+
+    Each entry is keyed by the path relative to the folder and records
+    the content hash, the outcome ("clean" or an error category such as
+    "error_duplicate_labels") and the cifkit version. A file is skipped
+    in later runs if it was clean with the same cifkit version and its
+    content has not changed. The size and modification time are checked
+    first so that unchanged files are not read again.
+
+    Examples
+    --------
+    >>> journal = PreprocessingJournal("tests/data/cif/ensemble_test")
+    >>> file_paths = journal.get_pending_file_paths(file_paths)
+    >>> ...  # Preprocess the pending files
+    >>> journal.record_outcomes(file_paths, error_types)
+    >>> journal.save()
+    """
+
+    def __init__(self, dir_path: str):
+        self.dir_path = dir_path
+        self.journal_path = os.path.join(dir_path, JOURNAL_FILE_NAME)
+        self.entries: dict[str, dict] = {}
+        self.is_modified = False
+        if os.path.exists(self.journal_path):
+            # An unreadable or corrupt journal is treated as empty
+            try:
+                with open(self.journal_path, "r") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            if isinstance(entries, dict):
+                self.entries = entries
+
+    def _get_key(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.dir_path)
+
+    def is_clean(self, file_path: str) -> bool:
+        """Check whether a file was clean and has not changed since."""
+        entry = self.entries.get(self._get_key(file_path))
+        if (
+            entry is None
+            or entry["outcome"] != CLEAN_OUTCOME
+            or entry["version"] != __version__
+        ):
+            return False
+
+        stat = os.stat(file_path)
+        if entry["file_size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        if get_file_hash(file_path) != entry["sha256"]:
+            return False
+        # Keep the hash check cheap for the next run, e.g., after a copy
+        entry["file_size"] = stat.st_size
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.is_modified = True
+        return True
+
+    def get_pending_file_paths(self, file_paths: list[str]) -> list[str]:
+        """Return the file paths that need to be preprocessed."""
+        return [file_path for file_path in file_paths if not self.is_clean(file_path)]
+
+    def record(self, file_path: str, outcome: str) -> None:
+        """Record the outcome of a file after preprocessing.
+
+        The hash is only recorded if the file is still in place.
+        """
+        entry = {"outcome": outcome, "version": __version__}
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            entry["sha256"] = get_file_hash(file_path)
+            entry["file_size"] = stat.st_size
+            entry["mtime_ns"] = stat.st_mtime_ns
+        self.entries[self._get_key(file_path)] = entry
+        self.is_modified = True
+
+    def record_outcomes(self, file_paths: list[str], error_types: dict[str, str]) -> None:
+        """Record each file as clean unless it has an error category."""
+        for file_path in file_paths:
+            self.record(file_path, error_types.get(file_path, CLEAN_OUTCOME))
+
+    def save(self) -> None:
+        """Save the journal in the folder if any entry has changed.
+
+        The journal is kept in memory only if the folder is read-only.
+        """
+        if not self.is_modified:
+            return
+        try:
+            with open(self.journal_path, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+        except OSError:
+            return
+        self.is_modified = False
@@ -1,3 +1,7 @@
+import warnings
+from collections import OrderedDict
+from collections.abc import Sequence
+
 import gemmi
 import numpy as np
 from gemmi.cif import Block
@@ -6,58 +10,269 @@ from cifkit.preprocessors import supercell_util
 from cifkit.utils import cif_parser
 
 
+class CellPoints(Sequence):
+    """Points of a unit cell or a supercell, stored as an (N, 3) array of
+    fractional coordinates and an int32 array of the index of the site
+    label of each point.
+
+    The points can be used as a read-only sequence of (x, y, z, label)
+    tuples, and a slice returns CellPoints. They are equal to CellPoints
+    or any sequence of the same tuples in the same order.
+
+    Examples
+    --------
+    >>> points = get_supercell_points(block, 1)
+    >>> points.coords.shape
+    (22, 3)
+    >>> points[0]
+    (0.0, 0.0, 0.0, 'U1')
+    """
+
+    def __init__(
+        self, coords: np.ndarray, site_indices: np.ndarray, site_labels: list[str]
+    ):
+        self.coords = coords
+        self.site_indices = site_indices
+        self.site_labels = site_labels
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        """Return the (x, y, z, label) tuple of a point, or the points of a
+        slice as CellPoints."""
+        if isinstance(index, slice):
+            return CellPoints(
+                self.coords[index], self.site_indices[index], self.site_labels
+            )
+        x, y, z = self.coords[index].tolist()
+        return x, y, z, self.site_labels[self.site_indices[index]]
+
+    def __iter__(self):
+        site_labels = self.site_labels
+        for (x, y, z), site_index in zip(
+            self.coords.tolist(), self.site_indices.tolist()
+        ):
+            yield x, y, z, site_labels[site_index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            isinstance(other_point, Sequence) and point == tuple(other_point)
+            for point, other_point in zip(self, other)
+        )
+
+    def __repr__(self) -> str:
+        return f"CellPoints({len(self)} points, {len(self.site_labels)} site labels)"
+
+    def get_site_coords(self, site_label: str) -> np.ndarray:
+        """Return the (n, 3) coordinates of the points of a site label."""
+        return self.coords[self.site_indices == self.site_labels.index(site_label)]
+
+
 def get_supercell_points(
     block,
-    supercell_size: int,
-) -> list[tuple[float, float, float, str]]:
-    """Return supercell points."""
-    supercell_points = []
-    loop_values = cif_parser.get_loop_values(block)
-    all_coords_list = get_unitcell_coords_for_all_labels(block)
-
-    # Get the total number of atoms in the unit cell
-    for i, all_coords in enumerate(all_coords_list):
-        points = flatten_original_coordinates(all_coords)
-        atom_site_label = loop_values[0][i]
-
-        supercell_points.extend(
-            shift_and_append_points(
-                points,
-                atom_site_label,
-                supercell_size,
+    supercell_size: int | tuple[int, int, int],
+    atom_site_table: np.ndarray = None,
+    site_labels: list[str] = None,
+) -> CellPoints:
+    """Return supercell points, in order of site, symmetry operation and
+    shift.
+
+    See `get_supercell_shifts` for the supercell size. If the atom site
+    loop has already been parsed with `cif_parser.get_atom_site_table`,
+    pass the table and its site labels to avoid parsing the loop again.
+    """
+    unitcell_points = get_unitcell_points(block, atom_site_table, site_labels)
+    return get_supercell_points_from_unitcell(unitcell_points, supercell_size)
+
+
+def get_unitcell_points(
+    block,
+    atom_site_table: np.ndarray = None,
+    site_labels: list[str] = None,
+) -> CellPoints:
+    """Return unit cell points after applying the symmetry operations,
+    in order of site and symmetry operation."""
+    if atom_site_table is None:
+        atom_site_table, site_labels, _ = cif_parser.get_atom_site_table(block)
+
+    coords, site_indices = get_unitcell_coords_and_site_indices(
+        block, atom_site_table, site_labels
+    )
+    return CellPoints(coords, site_indices, site_labels)
+
+
+def get_supercell_points_from_unitcell(
+    unitcell_points: CellPoints,
+    supercell_size: int | tuple[int, int, int],
+) -> CellPoints:
+    """Return supercell points by translating unit cell points, in order
+    of point and shift, without applying the symmetry operations again.
+
+    See `get_supercell_shifts` for the supercell size.
+    """
+    shifts = np.array(get_supercell_shifts(supercell_size), dtype=float)
+    coords = np.round(
+        (unitcell_points.coords[:, None, :] + shifts[None, :, :]).reshape(-1, 3), 5
+    )
+    site_indices = np.repeat(unitcell_points.site_indices, len(shifts))
+
+    unique_indices = get_unique_point_indices(coords, site_indices)
+    return CellPoints(
+        coords[unique_indices],
+        site_indices[unique_indices],
+        unitcell_points.site_labels,
+    )
+
+
+def get_points_for_plotting(points: CellPoints, tolerance: float = 1e-6) -> CellPoints:
+    """Return the points with the atoms at the unit cell boundaries
+    duplicated on the opposite faces, in order of point and image.
+
+    A coordinate within the tolerance of 0 gets an image at 1 minus the
+    coordinate, and one within the tolerance of 1 an image at 0, so a
+    corner atom appears at all 8 corners. The images of all points are
+    built at once with boolean masks and broadcasting.
+    """
+    coords = points.coords
+    is_near_zero = np.abs(coords) < tolerance
+    is_near_one = np.abs(coords - 1.0) < tolerance
+    image_coords = np.where(is_near_zero, 1.0 - coords, 0.0)
+    has_image = is_near_zero | is_near_one
+
+    # Pick the coordinate (0) or its image (1) along each axis, in the
+    # same order as looping over x, then y, then z
+    choices = np.array(
+        [[bx, by, bz] for bx in (0, 1) for by in (0, 1) for bz in (0, 1)], dtype=bool
+    )
+    all_coords = np.where(
+        choices[None, :, :], image_coords[:, None, :], coords[:, None, :]
+    )
+    is_valid = np.all(~choices[None, :, :] | has_image[:, None, :], axis=2)
+
+    all_coords = _round_like_builtin(all_coords[is_valid], 5)
+    site_indices = np.repeat(points.site_indices, len(choices))[is_valid.ravel()]
+    unique_indices = get_unique_point_indices(all_coords, site_indices)
+    return CellPoints(
+        all_coords[unique_indices], site_indices[unique_indices], points.site_labels
+    )
+
+
+def get_supercell_shifts(
+    supercell_size: int | tuple[int, int, int],
+) -> list[list[int]]:
+    """Return the unit cell translations of a supercell.
+
+    # Method 1 - No shifts
+    # Method 2 - +-1 +-1 +-1 shifts (This rarely used)
+    # Method 3 - +-2 +-2 +-2 shifts (5*5*5 of the unit cell)
+
+    A tuple (n_a, n_b, n_c) gives the shifts from -n to n along each
+    axis, e.g., from `supercell_util.get_supercell_extents`.
+    """
+    if isinstance(supercell_size, (tuple, list)):
+        if len(supercell_size) != 3 or min(supercell_size) < 0:
+            raise ValueError(
+                "Supercell extents must be 3 non-negative integers, "
+                f"not {supercell_size}."
             )
-        )
+        return supercell_util.get_shifts(supercell_size)
+    if supercell_size not in (1, 2, 3):
+        raise ValueError(f"Supercell size must be 1, 2 or 3, not {supercell_size}.")
+    return supercell_util._shift_xyz_plus_minus(supercell_size - 1)
+
+
+def get_unique_point_indices(coords: np.ndarray, site_indices: np.ndarray) -> np.ndarray:
+    """Return the sorted indices of the first occurrence of each point,
+    compared by site index and coordinates on a 1e-5 integer grid."""
+    if len(coords) == 0:
+        return np.arange(0)
+    grid_coords = np.rint(coords * 1e5).astype(np.int64)
+    _, first_indices = np.unique(
+        np.column_stack([site_indices, grid_coords]), axis=0, return_index=True
+    )
+    first_indices.sort()
+    return first_indices
 
-    return list(set(supercell_points))
+
+def get_unitcell_coords_and_site_indices(
+    block: Block,
+    atom_site_table: np.ndarray = None,
+    site_labels: list[str] = None,
+    symmetry_operations: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (N, 3) unique coordinates of the unit cell after
+    applying the symmetry operations and the int32 index of the site
+    label of each point."""
+    if atom_site_table is None:
+        atom_site_table, site_labels, _ = cif_parser.get_atom_site_table(block)
+
+    coords, row_indices = _get_unitcell_coords_per_row(
+        block, atom_site_table, symmetry_operations
+    )
+    site_indices = atom_site_table["label_index"].astype(np.int32)[row_indices]
+    unique_indices = get_unique_point_indices(coords, site_indices)
+    return coords[unique_indices], site_indices[unique_indices]
 
 
 def get_unitcell_coords_for_all_labels(
     block: Block,
+    atom_site_table: np.ndarray = None,
+    site_labels: list[str] = None,
+    symmetry_operations: np.ndarray = None,
 ) -> list[list[tuple[float, float, float, str]]]:
     """Compute the new coordinates after applying symmetry operations to
-    the initial coordinates."""
+    the initial coordinates, as a list of points per site."""
+    if atom_site_table is None:
+        atom_site_table, site_labels, _ = cif_parser.get_atom_site_table(block)
 
-    loop_values = cif_parser.get_loop_values(block)
-    loop_length = len(loop_values[0])
+    coords, row_indices = _get_unitcell_coords_per_row(
+        block, atom_site_table, symmetry_operations
+    )
+    row_ends = np.searchsorted(row_indices, np.arange(1, len(atom_site_table) + 1))
     coords_list = []
-    for i in range(loop_length):
-        (
-            site_label,
-            _,
-            coordinates,
-        ) = cif_parser.get_label_occupancy_coordinates(loop_values, i)
-
-        coords_after_symmetry_operations = (
-            get_unitcell_coords_after_sym_operations_per_label(
-                block,
-                coordinates,
-                site_label,
-            )
+    start = 0
+    for label_index, end in zip(
+        atom_site_table["label_index"].tolist(), row_ends.tolist()
+    ):
+        atom_site_label = site_labels[label_index]
+        coords_list.append(
+            [(x, y, z, atom_site_label) for x, y, z in coords[start:end].tolist()]
         )
-        coords_list.append(coords_after_symmetry_operations)
+        start = end
     return coords_list
 
 
+def _get_unitcell_coords_per_row(
+    block: Block,
+    atom_site_table: np.ndarray,
+    symmetry_operations: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the unique coordinates of each row of the atom site table
+    after applying the symmetry operations, and their sorted row
+    indices.
+
+    The symmetry operations are parsed once with
+    `get_symmetry_operations` unless passed, and applied to all sites at
+    once.
+    """
+    if len(atom_site_table) == 0:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    if symmetry_operations is None:
+        symmetry_operations = get_symmetry_operations(block)
+
+    site_fracs = np.stack(
+        [atom_site_table["x"], atom_site_table["y"], atom_site_table["z"]], axis=1
+    )
+    coords_per_site = apply_symmetry_operations(symmetry_operations, site_fracs)
+    coords = coords_per_site.reshape(-1, 3)
+    row_indices = np.repeat(np.arange(len(atom_site_table)), coords_per_site.shape[1])
+    unique_indices = get_unique_point_indices(coords, row_indices)
+    return coords[unique_indices], row_indices[unique_indices]
+
+
 # Function to find and return the appropriate loop for symmetry operations
 def find_symmetry_operations(block):
     # Try to find _space_group_symop_operation_xyz
@@ -70,95 +285,188 @@ def find_symmetry_operations(block):
         raise ValueError("No symmetry operations found in the CIF file.")
 
 
+def normalize_symmetry_operation(operation: str) -> str:
+    """Return a symmetry operation without quotes and whitespace in lower
+    case, e.g., "'X, Y, Z+1/2'" -> "x,y,z+1/2"."""
+    return "".join(operation.replace("'", "").split()).lower()
+
+
+def compile_symmetry_operations(operations: tuple[str, ...]) -> np.ndarray:
+    """Return the symmetry operations as an (n_ops, 3, 4) array of the
+    rotation matrices and the translation vectors, in units of
+    1/gemmi.Op.DEN so that the entries are integers.
+
+    Operations that gemmi cannot parse are skipped.
+    """
+    rots, trans = [], []
+    for operation in operations:
+        try:
+            op = gemmi.Op(operation)
+        except RuntimeError as e:
+            print(f"Skipping operation '{operation}': {str(e)}")
+            continue
+        rots.append(op.rot)
+        trans.append(op.tran)
+    return np.concatenate(
+        [
+            np.array(rots, dtype=float).reshape(-1, 3, 3),
+            np.array(trans, dtype=float).reshape(-1, 3, 1),
+        ],
+        axis=2,
+    )
+
+
+class SymmetryOperationsCache:
+    """Bounded LRU cache of compiled symmetry operations keyed by the
+    tuple of normalized operations, shared by all structures in a
+    process.
+
+    The cached arrays are read-only since they are shared.
+
+    Examples
+    --------
+    >>> SYMMETRY_OPERATIONS_CACHE.get(("x,y,z", "-x,-y,-z")).shape
+    (2, 3, 4)
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[str, ...], np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def operation_sets(self) -> list[tuple[str, ...]]:
+        """The cached sets of operations from least to most recently
+        used."""
+        return list(self._entries)
+
+    def get(self, operations: tuple[str, ...]) -> np.ndarray:
+        """Return the compiled operations, compiling them on a miss."""
+        symmetry_operations = self._entries.get(operations)
+        if symmetry_operations is not None:
+            self._entries.move_to_end(operations)
+            return symmetry_operations
+
+        symmetry_operations = compile_symmetry_operations(operations)
+        symmetry_operations.setflags(write=False)
+        self._entries[operations] = symmetry_operations
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return symmetry_operations
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Most files of an ensemble share a few hundred sets of operations
+SYMMETRY_OPERATIONS_CACHE = SymmetryOperationsCache()
+
+
+def get_symmetry_operations(block: Block) -> np.ndarray:
+    """Return the symmetry operations of a block as a read-only (n_ops,
+    3, 4) array, compiled once per set of operations in a process.
+
+    See `compile_symmetry_operations` for the layout.
+    """
+    return SYMMETRY_OPERATIONS_CACHE.get(
+        tuple(
+            normalize_symmetry_operation(operation)
+            for operation in find_symmetry_operations(block)
+        )
+    )
+
+
+def apply_symmetry_operations(
+    symmetry_operations: np.ndarray, site_fracs: np.ndarray
+) -> np.ndarray:
+    """Apply the symmetry operations to the (n_sites, 3) fractional
+    coordinates and return the (n_sites, n_ops, 3) coordinates wrapped
+    into the unit cell and rounded to 5 decimals."""
+    rot = symmetry_operations[None, :, :, :3]
+    tran = symmetry_operations[None, :, :, 3]
+    fracs = site_fracs[:, None, None, :]
+    # Same order of operations as gemmi.Op.apply_to_xyz
+    coords = (
+        rot[..., 0] * fracs[..., 0]
+        + rot[..., 1] * fracs[..., 1]
+        + rot[..., 2] * fracs[..., 2]
+        + tran
+    ) / gemmi.Op.DEN
+    # Adding 0.0 turns -0.0 into 0.0
+    return _round_like_builtin(coords % 1, 5) + 0.0
+
+
+def _round_like_builtin(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Round like the built-in round, which rounds the exact binary value
+    and thus differs from np.round for some values close to a tie, e.g.,
+    round(0.766325, 5) is 0.76632 but np.round gives 0.76633."""
+    rounded = np.round(values, decimals)
+    scaled = values * 10**decimals
+    is_near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if is_near_tie.any():
+        rounded[is_near_tie] = [
+            round(value, decimals) for value in values[is_near_tie].tolist()
+        ]
+    return rounded
+
+
+def _warn_deprecated(name: str, replacement: str) -> None:
+    warnings.warn(
+        f"{name} is deprecated and will be removed in the next release, "
+        f"use {replacement} instead.",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
 def get_unitcell_coords_after_sym_operations_per_label(
     block: Block,
     atom_site_fracs: tuple[float, float, float],
     atom_site_label: str,
 ) -> list[tuple[float, float, float, str]]:
     """Generate a list of coordinates for each atom site after applying
-    symmetry operations."""
-
-    symmetry_operations = find_symmetry_operations(block)
-    if symmetry_operations is not None:
-        all_coords = set()
-        for operation in symmetry_operations:
-            operation = operation.replace("'", "")
-            try:
-                op = gemmi.Op(operation)
-                new_x, new_y, new_z = op.apply_to_xyz(
-                    [
-                        atom_site_fracs[0],
-                        atom_site_fracs[1],
-                        atom_site_fracs[2],
-                    ]
-                )
-
-                new_x = new_x % 1
-                new_y = new_y % 1
-                new_z = new_z % 1
-
-                all_coords.add(
-                    (
-                        round(new_x, 5),
-                        round(new_y, 5),
-                        round(new_z, 5),
-                        atom_site_label,
-                    )
-                )
-
-            except RuntimeError as e:
-                print(f"Skipping operation '{operation}': {str(e)}")
-
-        return list(all_coords)
+    symmetry operations.
+
+    Deprecated, use `get_unitcell_points` instead.
+    """
+    _warn_deprecated(
+        "get_unitcell_coords_after_sym_operations_per_label", "get_unitcell_points"
+    )
+    coords = apply_symmetry_operations(
+        get_symmetry_operations(block), np.array([atom_site_fracs], dtype=float)
+    )[0]
+    unique_indices = get_unique_point_indices(coords, np.zeros(len(coords), int))
+    return [(x, y, z, atom_site_label) for x, y, z in coords[unique_indices].tolist()]
 
 
 def flatten_original_coordinates(
     all_coords: list[tuple[float, float, float, str]],
-):
-    points = np.array([list(map(float, coord[:-1])) for coord in all_coords])
-    return points
+) -> np.ndarray:
+    """Return the (N, 3) coordinates of (x, y, z, label) tuples.
+
+    Deprecated, use `CellPoints.coords` instead.
+    """
+    _warn_deprecated("flatten_original_coordinates", "CellPoints.coords")
+    return np.array([list(map(float, coord[:-1])) for coord in all_coords])
 
 
 def shift_and_append_points(
-    points,
+    points: np.ndarray,
     atom_site_label: str,
     supercell_generation_method: int,
-):
+) -> list[tuple[float, float, float, str]]:
     """Shift the unit cell's array of coordinates in the crystal frame
     to form the array containing the coordinates of the supercell.
 
-    # Method 1 - No sfhits
+    # Method 1 - No shifts
     # Method 2 - +-1 +-1 +-1 shifts (This rarely used)
     # Method 3 - +-2 +-2 +-2 shifts (5*5*5 of the unit cell)
+
+    Deprecated, use `get_supercell_points_from_unitcell` instead.
     """
-    if supercell_generation_method == 1:
-        shifts = np.array([[0, 0, 0]])
-        shifted_points = points[:, None, :] + shifts
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-        return all_points
-
-    if supercell_generation_method == 2:
-        shift_array = supercell_util._shift_xyz_plus_minus(1)
-        shift_array = np.array(shift_array)
-        shifted_points = points[:, None, :] + shift_array
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-        return all_points
-
-    if supercell_generation_method == 3:
-        shift_array = supercell_util._shift_xyz_plus_minus(2)
-        shift_array = np.array(shift_array)
-        shifted_points = points[:, None, :] + shift_array
-        all_points = []
-        for point_group in shifted_points:
-            for point in point_group:
-                new_point = (*np.round(point, 5), atom_site_label)
-                all_points.append(new_point)
-        return all_points
+    _warn_deprecated("shift_and_append_points", "get_supercell_points_from_unitcell")
+    shifts = np.array(get_supercell_shifts(supercell_generation_method))
+    shifted_points = np.round(points[:, None, :] + shifts, 5).reshape(-1, 3)
+    return [(x, y, z, atom_site_label) for x, y, z in shifted_points.tolist()]
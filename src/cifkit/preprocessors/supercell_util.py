@@ -1,5 +1,10 @@
 import numpy as np
 
+from cifkit.utils import unit
+
+# Default cutoff radius in Angstroms of the connections of each site
+DEFAULT_CUTOFF_RADIUS = 10.0
+
 
 def get_cell_atom_count(supercell_points) -> int:
     """Count the number of atoms in the cell."""
@@ -14,11 +19,35 @@ def _shift_xyz_plus_minus(size) -> list[int]:
     unit cell to the coordinates of the supercell that is created by
     shifting."
     """
+    return get_shifts((size, size, size))
+
+
+def get_shifts(extents: tuple[int, int, int]) -> list[list[int]]:
+    """Return the unit cell translations from -n to n along each axis
+    for the extents (n_a, n_b, n_c)."""
     arrays = []
-    dimensions = np.arange(-size, size + 1, 1)
-    dimensions = dimensions.tolist()
-    for h in dimensions:
-        for j in dimensions:
-            for k in dimensions:
+    h_values, j_values, k_values = (
+        np.arange(-extent, extent + 1, 1).tolist() for extent in extents
+    )
+    for h in h_values:
+        for j in j_values:
+            for k in k_values:
                 arrays.append([h, j, k])
     return arrays
+
+
+def get_supercell_extents(
+    cutoff_radius: float,
+    cell_lengths: list[float],
+    cell_angles_rad: list[float],
+) -> tuple[int, int, int]:
+    """Return the number of unit cell translations needed along each axis
+    so that every point closer than the cutoff radius to a point of the
+    unit cell is in the supercell.
+
+    A neighbor can be up to cutoff_radius / d away in fractional units
+    along an axis, where d is the spacing of the lattice planes normal to
+    it, so thin or skewed cells need more translations along some axes.
+    """
+    spacings = unit.get_interplanar_spacings(cell_lengths, cell_angles_rad)
+    return tuple(int(np.ceil(cutoff_radius / spacing)) for spacing in spacings)
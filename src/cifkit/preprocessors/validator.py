@@ -0,0 +1,50 @@
+from cifkit.preprocessors.format import preprocess_label_element_loop_values_in_content
+from cifkit.preprocessors.supercell import get_unitcell_points
+from cifkit.utils.cif_parser import (
+    check_unique_atom_site_labels,
+    get_atom_site_table,
+    get_cif_block_from_content,
+    get_cif_content,
+    get_formula_structure_weight_s_group,
+    get_unitcell_parameters_and_uncertainties,
+)
+from cifkit.utils.cif_sourcer import get_cif_db_source
+
+
+def validate_cif_content(content: str, file_path: str = "") -> str:
+    """Run the parse, label and symmetry checks of a formatted .cif file
+    and return its text with the PCD site labels preprocessed.
+
+    The block is parsed, the atom site loop, cell parameters and formula
+    are read, and the symmetry operations are applied to the sites as
+    when initializing a Cif object, so the same exceptions are raised and
+    `error.get_error_type` assigns the same categories. No Cif object is
+    built, so the site pairs, mixing types and radius data are skipped.
+    """
+    block = get_cif_block_from_content(content)
+    atom_site_table, site_labels, _ = get_atom_site_table(block)
+    get_unitcell_parameters_and_uncertainties(block)
+    get_formula_structure_weight_s_group(block)
+    get_unitcell_points(block, atom_site_table, site_labels)
+    if get_cif_db_source(file_path, content=content) == "PCD":
+        modified_content = preprocess_label_element_loop_values_in_content(content)
+        if modified_content != content:
+            content = modified_content
+            block = get_cif_block_from_content(content)
+
+    # Check site element can be parsed from site label
+    check_unique_atom_site_labels(file_path, block=block)
+    return content
+
+
+def validate_cif_file(file_path: str) -> None:
+    """Run the parse, label and symmetry checks of a formatted .cif file,
+    writing back the preprocessed PCD site labels.
+
+    See `validate_cif_content` for the raised exceptions.
+    """
+    content = get_cif_content(file_path)
+    modified_content = validate_cif_content(content, file_path)
+    if modified_content != content:
+        with open(file_path, "w") as f:
+            f.write(modified_content)
@@ -1,11 +1,32 @@
 import os
 
-from cifkit.preprocessors.format import preprocess_label_element_loop_values
+from cifkit.preprocessors.format import preprocess_label_element_loop_values_in_content
 from cifkit.utils import cif_parser
 
 # Parser .cif file
-from cifkit.utils.cif_parser import check_unique_atom_site_labels
+from cifkit.utils.cif_parser import (
+    check_unique_atom_site_labels,
+    get_cif_block_from_content,
+)
 from cifkit.utils.cif_sourcer import get_cif_db_source
+from cifkit.utils.parallel import map_in_processes
+
+
+def remove_author_loop_from_content(content: str) -> str:
+    """Return the text of a .cif file with the author section replaced
+    by an empty entry, without reading or writing any file."""
+    original_lines = cif_parser.get_lines_from_content(content)
+    (
+        start_index,
+        end_index,
+    ) = cif_parser.get_start_end_line_indexes(
+        None, "_publ_author_address", lines=original_lines
+    )
+
+    # Replace the specific section in original_lines with modified_lines
+    original_lines[start_index:end_index] = ["''\n", ";\n", ";\n"]
+
+    return "".join(original_lines)
 
 
 def remove_author_loop(file_path: str) -> None:
@@ -14,19 +35,21 @@ def remove_author_loop(file_path: str) -> None:
 
     This is a common issue in PCD files.
     """
-    (
-        start_index,
-        end_index,
-    ) = cif_parser.get_start_end_line_indexes(file_path, "_publ_author_address")
-
     with open(file_path, "r") as f:
-        original_lines = f.readlines()
-
-        # Replace the specific section in original_lines with modified_lines
-        original_lines[start_index:end_index] = ["''\n", ";\n", ";\n"]
+        content = f.read()
 
     with open(file_path, "w") as f:
-        f.writelines(original_lines)
+        f.write(remove_author_loop_from_content(content))
+
+
+def add_hashtag_in_first_line_of_content(content: str) -> str:
+    """Return the text of a .cif file with a # added before (C) if the
+    first line starts with (C)."""
+    if content.startswith("(C)"):
+        # Modify the first line by adding a # right after (C)
+        content = content.replace("(C)", "# (C)", 1)
+
+    return content
 
 
 def add_hashtag_in_first_line(file_path: str):
@@ -40,30 +63,53 @@ def add_hashtag_in_first_line(file_path: str):
 
     # Read the contents of the file
     with open(file_path, "r") as file:
-        lines = file.readlines()
-
-    # Check if the first line starts with (C)
-    if lines and lines[0].startswith("(C)"):
-        # Modify the first line by adding a # right after (C)
-        lines[0] = lines[0].replace("(C)", "# (C)", 1)
+        content = file.read()
 
+    modified_content = add_hashtag_in_first_line_of_content(content)
+    if modified_content != content:
         # Write the modified content back to the file
         with open(file_path, "w") as file:
-            file.writelines(lines)
+            file.write(modified_content)
 
 
-def edit_cif_file_based_on_db(file_path: str):
-    """Edit a CIF file based on the database it is from.
+def edit_cif_content_based_on_db(content: str, file_path: str = "") -> str:
+    """Return the text of a .cif file edited based on the database it is
+    from, without reading or writing any file.
 
     PCD: Remove author loop and preprocess label element loop values
     ICSD: Add a hashtag in the first line
     """
-    db_source = get_cif_db_source(file_path)
+    db_source = get_cif_db_source(file_path, content=content)
     if db_source == "ICSD":
-        add_hashtag_in_first_line(file_path)
+        content = add_hashtag_in_first_line_of_content(content)
     elif db_source == "PCD":
-        remove_author_loop(file_path)
+        content = remove_author_loop_from_content(content)
         # Preprocessing the label is only tested on PCD files
-        preprocess_label_element_loop_values(file_path)
+        content = preprocess_label_element_loop_values_in_content(content)
+
+    check_unique_atom_site_labels(file_path, block=get_cif_block_from_content(content))
+    return content
+
 
-    check_unique_atom_site_labels(file_path)
+def edit_cif_file_based_on_db(file_path: str):
+    """Edit a CIF file based on the database it is from.
+
+    PCD: Remove author loop and preprocess label element loop values
+    ICSD: Add a hashtag in the first line
+    """
+    with open(file_path, "r") as f:
+        content = f.read()
+
+    modified_content = edit_cif_content_based_on_db(content, file_path)
+    if modified_content != content:
+        with open(file_path, "w") as f:
+            f.write(modified_content)
+
+
+def edit_cif_files_based_on_db(file_paths: list[str], n_workers=1) -> None:
+    """Edit .cif files based on the database they are from across
+    `n_workers` processes, or all CPUs if None.
+
+    The first error in the order of `file_paths` is raised.
+    """
+    map_in_processes(edit_cif_file_based_on_db, file_paths, n_workers=n_workers)
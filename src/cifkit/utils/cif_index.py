@@ -0,0 +1,224 @@
+"""Index the byte offsets of data blocks in large .cif files for random
+access through mmap."""
+
+import json
+import mmap
+import os
+from typing import Iterator
+
+from cifkit.utils.cif_reader import get_block_file_path, iter_cif_block_line_spans
+from cifkit.utils.error_messages import FileError
+
+INDEX_EXTENSION = ".index.json"
+
+# How the blocks of an index are keyed, by block name or by packed file name
+BLOCK_NAME_KEY = "block_name"
+FILE_NAME_KEY = "file_name"
+
+
+def get_index_path(file_path: str) -> str:
+    """Return the default path of the index of a .cif file."""
+    return file_path + INDEX_EXTENSION
+
+
+def iter_cif_block_offsets(file_path: str) -> Iterator[tuple[str, int, int]]:
+    """Yield the name and the [start, end) byte offsets of each data block
+    in a .cif file, scanned once line by line."""
+    # Offsets of the lines read since the end of the last block
+    line_offsets: list[int] = []
+
+    with open(file_path, "rb") as f:
+
+        def read_lines():
+            offset = 0
+            for line in f:
+                line_offsets.append(offset)
+                offset += len(line)
+                # Latin-1 maps every byte to a character of the same length
+                yield line.decode("latin-1")
+            line_offsets.append(offset)
+
+        first_line = 0
+        for block_name, start, end in iter_cif_block_line_spans(read_lines()):
+            yield (
+                block_name,
+                line_offsets[start - first_line],
+                line_offsets[end - first_line],
+            )
+            del line_offsets[: end - first_line]
+            first_line = end
+
+
+def build_cif_index(file_path: str) -> dict[str, tuple[int, int]]:
+    """Return the byte offsets of each data block in a .cif file keyed by
+    block name.
+
+    A repeated block name is suffixed with its occurrence count, e.g.,
+    "260569_2", so that every block can be accessed.
+    """
+    index: dict[str, tuple[int, int]] = {}
+    name_counts: dict[str, int] = {}
+    for block_name, start, end in iter_cif_block_offsets(file_path):
+        name_counts[block_name] = name_counts.get(block_name, 0) + 1
+        if name_counts[block_name] > 1:
+            block_name = f"{block_name}_{name_counts[block_name]}"
+        index[block_name] = (start, end)
+    return index
+
+
+def _get_file_stamp(file_path: str) -> dict[str, int]:
+    """Return the size and modification time used to detect a stale
+    index."""
+    stat = os.stat(file_path)
+    return {"file_size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_cif_index(
+    file_path: str,
+    index: dict[str, tuple[int, int]],
+    index_path: str = None,
+    key: str = BLOCK_NAME_KEY,
+) -> None:
+    """Save the index of a .cif file as JSON, by default next to it,
+    with how its blocks are keyed."""
+    with open(index_path or get_index_path(file_path), "w") as f:
+        json.dump({**_get_file_stamp(file_path), "key": key, "blocks": index}, f)
+
+
+def load_cif_index(file_path: str, index_path: str = None) -> dict[str, tuple[int, int]]:
+    """Return the index of a .cif file.
+
+    The saved index is used if the file has not changed since it was
+    built. Otherwise, the file is scanned once and the index is saved if
+    possible, e.g., not on a read-only mount, or only kept in memory.
+
+    Raises
+    ------
+    ValueError
+        If the file is a pack from `pack_cif_files` that changed since it
+        was indexed, since the file names of its IDs cannot be recovered.
+    """
+    index_path = index_path or get_index_path(file_path)
+    if os.path.exists(index_path):
+        with open(index_path, "r") as f:
+            saved_index = json.load(f)
+        if all(
+            saved_index.get(key) == value
+            for key, value in _get_file_stamp(file_path).items()
+        ):
+            return {
+                block_name: tuple(offsets)
+                for block_name, offsets in saved_index["blocks"].items()
+            }
+        if saved_index.get("key") == FILE_NAME_KEY:
+            raise ValueError(FileError.STALE_PACK_INDEX.value.format(file_path=file_path))
+
+    index = build_cif_index(file_path)
+    try:
+        write_cif_index(file_path, index, index_path)
+    except OSError:
+        pass
+    return index
+
+
+def pack_cif_files(
+    file_paths: list[str], pack_path: str, index_path: str = None
+) -> dict[str, tuple[int, int]]:
+    """Concatenate .cif files into a single pack file and save its index.
+
+    Each file is indexed by its file name without the .cif extension.
+
+    Raises
+    ------
+    ValueError
+        If two files have the same file name, before the pack is written.
+    """
+    cif_ids = [os.path.splitext(os.path.basename(path))[0] for path in file_paths]
+    seen_ids = set()
+    for cif_id in cif_ids:
+        if cif_id in seen_ids:
+            raise ValueError(FileError.DUPLICATE_PACK_ID.value.format(cif_id=cif_id))
+        seen_ids.add(cif_id)
+
+    index: dict[str, tuple[int, int]] = {}
+    offset = 0
+    with open(pack_path, "wb") as pack:
+        for cif_id, file_path in zip(cif_ids, file_paths):
+            with open(file_path, "rb") as f:
+                content = f.read()
+            if content and not content.endswith(b"\n"):
+                content += b"\n"
+            pack.write(content)
+            index[cif_id] = (offset, offset + len(content))
+            offset += len(content)
+
+    write_cif_index(pack_path, index, index_path, key=FILE_NAME_KEY)
+    return index
+
+
+class CifPack:
+    """Random access to the data blocks of a large .cif file or a pack
+    file through mmap.
+
+    Examples
+    --------
+    >>> with CifPack("COD_dump.cif") as pack:
+    ...     cif = pack.get_cif("1000000")
+    """
+
+    def __init__(self, file_path: str, index_path: str = None):
+        self.file_path = file_path
+        self.index = load_cif_index(file_path, index_path)
+        self._file = open(file_path, "rb")
+        # An empty file cannot be mapped
+        self._mmap = None
+        if os.path.getsize(file_path):
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, cif_id: str) -> bool:
+        return cif_id in self.index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def ids(self) -> list[str]:
+        """The IDs of the structures in file order."""
+        return list(self.index)
+
+    def get_file_path(self, cif_id: str) -> str:
+        """Return the path used to name a structure in the pack."""
+        return get_block_file_path(self.file_path, cif_id)
+
+    def get_content(self, cif_id: str) -> bytes:
+        """Return the raw text of a structure without scanning the file."""
+        start, end = self.index[cif_id]
+        return self._mmap[start:end]
+
+    def get_cif(self, cif_id: str, is_formatted=False, **kwargs):
+        """Return a Cif object of a structure, preprocessed in memory.
+
+        Additional keyword arguments are passed to Cif.
+        """
+        # Imported here since the Cif model depends on the utils package
+        from cifkit.models.cif import Cif
+
+        return Cif(
+            self.get_file_path(cif_id),
+            is_formatted=is_formatted,
+            content=self.get_content(cif_id),
+            **kwargs,
+        )
+
+    def close(self) -> None:
+        """Release the memory map and the file handle."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
@@ -1,8 +1,10 @@
 """Parses attributes from a .cif file."""
 
+import gzip
 from typing import Any
 
 import gemmi
+import numpy as np
 from gemmi.cif import Block, Column
 
 from cifkit.utils import unit
@@ -11,6 +13,7 @@ from cifkit.utils.string_parser import (
     clean_parsed_structure,
     get_atom_type_from_label,
     get_string_to_formatted_float,
+    get_strings_to_floats_and_uncertainties,
     strip_numbers_and_symbols,
     trim_string,
 )
@@ -24,37 +27,106 @@ def get_cif_block(file_path: str) -> Block:
     return block
 
 
+def get_cif_content(file_path: str) -> str:
+    """Return the full text of a .cif file read in a single pass, which
+    is decompressed on the fly if it ends with .gz."""
+    open_file = gzip.open if file_path.endswith(".gz") else open
+    with open_file(file_path, "rt") as f:
+        content = f.read()
+
+    return content
+
+
+def decode_cif_content(content: str | bytes) -> str:
+    """Return the text of a .cif file given as str or bytes.
+
+    Bytes are decoded as UTF-8 and line endings are normalized the same
+    way as when a file is opened in text mode.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+    return content
+
+
+def get_lines_from_content(content: str) -> list[str]:
+    """Split the text of a .cif file into lines, keeping the line
+    endings like `readlines()`."""
+    lines = [line + "\n" for line in content.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+
+    return lines
+
+
+def get_cif_block_from_content(content: str) -> Block:
+    """Return CIF block from the text of a .cif file."""
+    doc = gemmi.cif.read_string(content)
+    block = doc.sole_block()
+
+    return block
+
+
+def get_tag_floats_and_uncertainties(
+    block: Block, keys: list[str]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the float values and standard uncertainties of tags."""
+    return get_strings_to_floats_and_uncertainties(block.find_value(key) for key in keys)
+
+
+UNITCELL_KEYS = [
+    "_cell_length_a",
+    "_cell_length_b",
+    "_cell_length_c",
+    "_cell_angle_alpha",
+    "_cell_angle_beta",
+    "_cell_angle_gamma",
+]
+
+
+def get_unitcell_parameters_and_uncertainties(
+    block: Block,
+) -> tuple[list[float], list[float], list[float], list[float]]:
+    """Return the unit cell lengths, the angles in radians and their
+    standard uncertainties, with NaN where none is given, from a single
+    parse of the six cell tags."""
+    values, uncertainties = get_tag_floats_and_uncertainties(block, UNITCELL_KEYS)
+    uncertainties[3:] = np.radians(uncertainties[3:])
+
+    return (
+        values[:3].tolist(),
+        unit.get_radians_from_degrees(values[3:].tolist()),
+        uncertainties[:3].tolist(),
+        uncertainties[3:].tolist(),
+    )
+
+
 def get_unitcell_lengths(
     block: Block,
 ) -> list[float]:
     """Return the unit cell lengths."""
-    keys_lengths = [
-        "_cell_length_a",
-        "_cell_length_b",
-        "_cell_length_c",
-    ]
+    lengths, _ = get_tag_floats_and_uncertainties(block, UNITCELL_KEYS[:3])
 
-    lengths = [
-        get_string_to_formatted_float(block.find_value(key)) for key in keys_lengths
-    ]
-
-    return lengths
+    return lengths.tolist()
 
 
 def get_unitcell_angles_rad(
     block: Block,
 ) -> list[float]:
     """Return the unit cell angles."""
+    angles, _ = get_tag_floats_and_uncertainties(block, UNITCELL_KEYS[3:])
 
-    keys_angles = [
-        "_cell_angle_alpha",
-        "_cell_angle_beta",
-        "_cell_angle_gamma",
-    ]
+    return unit.get_radians_from_degrees(angles.tolist())
 
-    angles = [get_string_to_formatted_float(block.find_value(key)) for key in keys_angles]
 
-    return unit.get_radians_from_degrees(angles)
+def get_unitcell_uncertainties(
+    block: Block,
+) -> tuple[list[float], list[float]]:
+    """Return the standard uncertainties of the unit cell lengths and of
+    the angles in radians, with NaN where none is given."""
+    return get_unitcell_parameters_and_uncertainties(block)[2:]
 
 
 def get_loop_tags() -> list[str]:
@@ -133,6 +205,99 @@ def get_label_occupancy_coordinates(
     return label, occupancy, coordinates
 
 
+ATOM_SITE_DTYPE = np.dtype(
+    [
+        ("label_index", np.int32),
+        ("element_index", np.int32),
+        ("multiplicity", np.int32),
+        ("wyckoff", "U8"),
+        ("x", np.float64),
+        ("y", np.float64),
+        ("z", np.float64),
+        ("occupancy", np.float64),
+        ("x_su", np.float64),
+        ("y_su", np.float64),
+        ("z_su", np.float64),
+        ("occupancy_su", np.float64),
+    ]
+)
+
+
+def get_atom_site_table(
+    block: Block,
+) -> tuple[np.ndarray, list[str], list[str]]:
+    """Return the atom site loop as a structured array of ATOM_SITE_DTYPE
+    with one row per site, along with the site labels and the elements
+    indexed by the label_index and element_index fields.
+
+    The standard uncertainties of the coordinates and occupancy are kept
+    in the x_su, y_su, z_su and occupancy_su fields, with NaN where none
+    is given. Elements are listed in the order of their first site. A
+    missing multiplicity column is filled with -1 and a missing Wyckoff
+    symbol column with an empty string.
+
+    Raises
+    ------
+    ValueError
+        If a coordinate or occupancy column is missing.
+    """
+    loop_vals = get_loop_values(block)
+    site_labels = list(loop_vals[0])
+    table = np.zeros(len(site_labels), dtype=ATOM_SITE_DTYPE)
+    table["label_index"] = np.arange(len(site_labels))
+
+    elements = []
+    if loop_vals[1]:
+        element_indexes: dict[str, int] = {}
+        for i, symbol in enumerate(loop_vals[1]):
+            element = strip_numbers_and_symbols(symbol)
+            if element not in element_indexes:
+                element_indexes[element] = len(elements)
+                elements.append(element)
+            table["element_index"][i] = element_indexes[element]
+    else:
+        table["element_index"] = -1
+
+    table["multiplicity"] = (
+        np.array(list(loop_vals[2]), dtype=np.int32) if loop_vals[2] else -1
+    )
+    if loop_vals[3]:
+        table["wyckoff"] = list(loop_vals[3])
+    for field, column in zip(["x", "y", "z", "occupancy"], loop_vals[4:8]):
+        if not column:
+            raise ValueError(CifParserError.MISSING_COORDINATES.value)
+        table[field], table[f"{field}_su"] = get_strings_to_floats_and_uncertainties(
+            column
+        )
+
+    return table, site_labels, elements
+
+
+def get_atom_site_info_from_table(
+    table: np.ndarray, site_labels: list[str], elements: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Return the atom site information keyed by label from the table of
+    `get_atom_site_table`, with None for missing values."""
+
+    def get_value(value):
+        return None if value != value else value  # NaN is not equal to itself
+
+    atom_site_info = {}
+    for row in table.tolist():
+        label_index, element_index, multiplicity, wyckoff, x, y, z, occupancy = row[:8]
+        atom_site_info[site_labels[label_index]] = {
+            "element": elements[element_index] if element_index >= 0 else None,
+            "site_occupancy": get_value(occupancy),
+            "x_frac_coord": get_value(x),
+            "y_frac_coord": get_value(y),
+            "z_frac_coord": get_value(z),
+            "symmetry_multiplicity": multiplicity if multiplicity >= 0 else None,
+            "wyckoff_symbol": wyckoff or None,
+        }
+
+    return atom_site_info
+
+
 def get_loop_value_dict(
     loop_values: list,
 ) -> dict[str, dict[str, Any]]:
@@ -154,12 +319,19 @@ def get_loop_value_dict(
     return loop_value_dict
 
 
-def get_start_end_line_indexes(file_path: str, start_keyword: str) -> tuple[int, int]:
+def get_start_end_line_indexes(
+    file_path: str, start_keyword: str, lines: list[str] = None
+) -> tuple[int, int]:
     """Find the starting and ending indexes of the lines in
-    atom_site_loop."""
+    atom_site_loop.
+
+    If the lines of the file have already been read, pass them as
+    `lines` to search them in memory instead.
+    """
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
+    if lines is None:
+        with open(file_path, "r") as f:
+            lines = f.readlines()
 
     start_index = 0
     end_index = 0
@@ -179,20 +351,25 @@ def get_start_end_line_indexes(file_path: str, start_keyword: str) -> tuple[int,
     return start_index, end_index
 
 
-def get_line_content_from_tag(file_path: str, start_keyword: str) -> list[str]:
+def get_line_content_from_tag(
+    file_path: str, start_keyword: str, lines: list[str] = None
+) -> list[str]:
     """Returns a list containing file content with starting keyword.
 
     This function only appropriate for PCD format for removing the
     author section.
     """
-    start_index, end_index = get_start_end_line_indexes(file_path, start_keyword)
+    if lines is None:
+        with open(file_path, "r") as f:
+            lines = f.readlines()
+
+    start_index, end_index = get_start_end_line_indexes(
+        file_path, start_keyword, lines=lines
+    )
 
     if start_index is None or end_index is None:
         return None
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-
     # Extract the content between start_index and end_index
     content_lines = lines[start_index:end_index]
 
@@ -200,9 +377,11 @@ def get_line_content_from_tag(file_path: str, start_keyword: str) -> list[str]:
 
 
 def get_formula_structure_weight_s_group(
-    block: Block,
+    block: Block, with_weight_su=False
 ) -> tuple[str, str, float, int, str]:
-    """Return the unit cell lengths."""
+    """Return the formula, structure, weight, space group number and
+    name, followed by the standard uncertainty of the weight if
+    `with_weight_su` is True, NaN if none is given."""
     keys = [
         "_chemical_formula_structural",
         "_chemical_name_structure_type",
@@ -216,10 +395,15 @@ def get_formula_structure_weight_s_group(
     # Process each value, only if it is not None
     formula = trim_string(values[0]) if values[0] else None
     structure = clean_parsed_structure(values[1]) if values[1] else None
-    weight = get_string_to_formatted_float(values[2]) if values[2] else None
+    weight = weight_su = None
+    if values[2]:
+        weights, weight_sus = get_strings_to_floats_and_uncertainties([values[2]])
+        weight, weight_su = weights.item(), weight_sus.item()
     s_group_num = int(trim_string(values[3])) if values[3] else None
     s_group_name = trim_string(values[4]) if values[4] else None
 
+    if with_weight_su:
+        return (formula, structure, weight, s_group_num, s_group_name, weight_su)
     return (formula, structure, weight, s_group_num, s_group_name)
 
 
@@ -255,79 +439,61 @@ def get_unique_formulas_structures_weights_s_groups(
     return formulas, structures, weights, s_group_nums, s_group_names
 
 
-def get_tag_from_third_line(file_path: str, db_source="PCD") -> str:
+def get_tag_from_third_line(file_path: str, db_source="PCD", content=None) -> str:
     """Extract the tag from the provided CIF file path appropriate for
-    PCD db source only."""
+    PCD db source only.
+
+    If the file content has already been read, pass it as `content` to
+    avoid opening the file again.
+    """
 
     if not db_source == "PCD":
         return None
 
-    with open(file_path, "r") as f:
-        # Read first three lines
-        f.readline()  # First line
-        f.readline()  # Second line
-        third_line = f.readline().strip()  # Third line
-        third_line = third_line.replace(",", "")
+    if content is None:
+        with open(file_path, "r") as f:
+            # Read first three lines
+            lines = [f.readline() for _ in range(3)]
+    else:
+        lines = content.split("\n", 3)[:3]
 
-        # Split based on '#' and filter out empty strings
-        third_line_parts = [
-            part.strip() for part in third_line.split("#") if part.strip()
-        ]
+    third_line = lines[2].strip()  # Third line
+    third_line = third_line.replace(",", "")
 
-        formula_tag = third_line_parts[1]
-        parts = formula_tag.split()
+    # Split based on '#' and filter out empty strings
+    third_line_parts = [part.strip() for part in third_line.split("#") if part.strip()]
 
-        # Return concatenated string of parts excluding the first one
-        if len(parts) > 1:
-            return "_".join(parts[1:])
-        else:
-            return ""
+    formula_tag = third_line_parts[1]
+    parts = formula_tag.split()
 
+    # Return concatenated string of parts excluding the first one
+    if len(parts) > 1:
+        return "_".join(parts[1:])
+    else:
+        return ""
 
-def parse_atom_site_occupancy_info(file_path: str) -> dict:
+
+def parse_atom_site_occupancy_info(file_path: str, block: Block = None) -> dict:
     """Parse atom site loop information including element, occupancy,
-    fractional coordinates, multiplicity, and wyckoff symbol."""
-    block = get_cif_block(file_path)
-    loop_vals = get_loop_values(block)
-    label_count = len(loop_vals[0])
-
-    parsed_data = {}
-
-    for i in range(label_count):
-        # Safely extract data, assuming the possibility of None values in columns
-        atom_site_label = loop_vals[0][i] if loop_vals[0] else None
-        element = strip_numbers_and_symbols(loop_vals[1][i]) if loop_vals[1] else None
-        symmetry_multiplicity = int(loop_vals[2][i]) if loop_vals[2] else None
-        wyckoff_symbol = loop_vals[3][i] if loop_vals[3] else None
-        x_frac_coord = (
-            get_string_to_formatted_float(loop_vals[4][i]) if loop_vals[4] else None
-        )
-        y_frac_coord = (
-            get_string_to_formatted_float(loop_vals[5][i]) if loop_vals[5] else None
-        )
-        z_frac_coord = (
-            get_string_to_formatted_float(loop_vals[6][i]) if loop_vals[6] else None
-        )
-        site_occupancy = (
-            get_string_to_formatted_float(loop_vals[7][i]) if loop_vals[7] else None
-        )
+    fractional coordinates, multiplicity, and wyckoff symbol.
 
-        parsed_data[atom_site_label] = {
-            "element": element,
-            "site_occupancy": site_occupancy,
-            "x_frac_coord": x_frac_coord,  # Clearly label as fractional
-            "y_frac_coord": y_frac_coord,  # Clearly label as fractional
-            "z_frac_coord": z_frac_coord,  # Clearly label as fractional
-            "symmetry_multiplicity": symmetry_multiplicity,
-            "wyckoff_symbol": wyckoff_symbol,
-        }
+    If the CIF block has already been parsed, pass it as `block` to
+    avoid parsing the file again.
+    """
+    if block is None:
+        block = get_cif_block(file_path)
+
+    return get_atom_site_info_from_table(*get_atom_site_table(block))
 
-    return parsed_data
 
+def check_unique_atom_site_labels(file_path: str, block: Block = None):
+    """Check whether all parsed atom site labels are unique.
 
-def check_unique_atom_site_labels(file_path: str):
-    """Check whether all parsed atom site labels are unique."""
-    block = get_cif_block(file_path)
+    If the CIF block has already been parsed, pass it as `block` to
+    avoid parsing the file again.
+    """
+    if block is None:
+        block = get_cif_block(file_path)
 
     loop_values = get_loop_values(block)
 
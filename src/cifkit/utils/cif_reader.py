@@ -0,0 +1,202 @@
+"""Stream structures from multi-block .cif files and compressed
+archives."""
+
+import gzip
+import os
+import tarfile
+import zipfile
+from typing import Iterable, Iterator
+
+from cifkit.utils.cif_parser import decode_cif_content, get_lines_from_content
+from cifkit.utils.cif_scanner import CifHeader, scan_cif_header
+
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ARCHIVE_EXTENSIONS = TAR_EXTENSIONS + (".zip", ".gz")
+
+
+def _is_data_block_start(line: str) -> bool:
+    """Check whether a line opens a new data block."""
+    return line.lstrip()[:5].lower() == "data_"
+
+
+def _get_carried_line_count(trailing_lines: list[str]) -> int:
+    """Return how many of the comment lines after the last value of a
+    block belong to the header of the next block.
+
+    A banner of "#" characters opens the header of the next block, e.g.,
+    in PCD or CCDC files. Otherwise, only the comment lines following the
+    last blank line are carried.
+    """
+    for i, line in enumerate(trailing_lines):
+        if line.startswith("#####"):
+            return len(trailing_lines) - i
+    for i in range(len(trailing_lines) - 1, -1, -1):
+        if not trailing_lines[i].strip():
+            return len(trailing_lines) - i - 1
+    return 0
+
+
+def iter_cif_block_line_spans(lines: Iterable[str]) -> Iterator[tuple[str, int, int]]:
+    """Yield the name and the [start, end) line indexes of each data block
+    from the lines of a .cif file without keeping the lines in memory.
+
+    Lines before the first data block and the comment header directly
+    preceding each data block are kept with that block so that the
+    database source and the PCD tag can still be parsed.
+    """
+    block_name = None
+    block_start = 0
+    trailing_lines: list[str] = []
+    is_in_text_field = False
+    line_count = 0
+
+    for i, line in enumerate(lines):
+        line_count = i + 1
+        if line.startswith(";"):
+            is_in_text_field = not is_in_text_field
+        elif not is_in_text_field and _is_data_block_start(line):
+            next_block_start = i - _get_carried_line_count(trailing_lines)
+            if block_name is None:
+                # Keep everything before the first data block
+                next_block_start = 0
+            else:
+                yield block_name, block_start, next_block_start
+            block_name = line.strip()[5:].split()[0] if line.strip()[5:] else ""
+            block_start = next_block_start
+            trailing_lines = []
+            continue
+
+        stripped = line.strip()
+        if not is_in_text_field and (not stripped or stripped.startswith("#")):
+            trailing_lines.append(line)
+        else:
+            trailing_lines = []
+
+    if block_name is not None:
+        yield block_name, block_start, line_count
+
+
+def iter_cif_blocks_from_lines(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """Yield the name and text of each data block from the lines of a
+    .cif file, holding a single block in memory at a time."""
+    buffer: list[str] = []
+
+    def read_lines():
+        for line in lines:
+            buffer.append(line)
+            yield line
+
+    buffer_start = 0
+    for block_name, start, end in iter_cif_block_line_spans(read_lines()):
+        yield block_name, "".join(buffer[start - buffer_start : end - buffer_start])
+        del buffer[: end - buffer_start]
+        buffer_start = end
+
+
+def iter_cif_blocks(file_path: str) -> Iterator[tuple[str, str]]:
+    """Yield the name and text of each data block in a .cif file, which
+    is decompressed on the fly if it ends with .gz.
+
+    Examples
+    --------
+    >>> for block_name, content in iter_cif_blocks("COD_dump.cif"):
+    ...     print(block_name)
+    1000000
+    1000001
+    """
+    open_file = gzip.open if file_path.endswith(".gz") else open
+    with open_file(file_path, "rt") as f:
+        yield from iter_cif_blocks_from_lines(f)
+
+
+def get_block_file_path(file_path: str, block_name: str) -> str:
+    """Return the path used to name a data block inside a .cif file."""
+    return os.path.join(file_path, f"{block_name}.cif")
+
+
+def iter_cif_headers(file_path: str) -> Iterator[CifHeader]:
+    """Yield a metadata record for each data block in a .cif file."""
+    for block_name, content in iter_cif_blocks(file_path):
+        yield scan_cif_header(content, get_block_file_path(file_path, block_name))
+
+
+def iter_cifs(file_path: str, is_formatted=False, **kwargs) -> Iterator:
+    """Yield a Cif object for each data block in a .cif file.
+
+    Each block is preprocessed in memory and never written to disk.
+    Additional keyword arguments are passed to Cif.
+    """
+    # Imported here since the Cif model depends on the utils package
+    from cifkit.models.cif import Cif
+
+    for block_name, content in iter_cif_blocks(file_path):
+        yield Cif(
+            get_block_file_path(file_path, block_name),
+            is_formatted=is_formatted,
+            content=content,
+            **kwargs,
+        )
+
+
+def iter_cif_blocks_from_content(
+    content: str | bytes, file_path: str
+) -> Iterator[tuple[str, str]]:
+    """Yield the path and text of each data block in the text of a .cif
+    file, named with `get_block_file_path`."""
+    lines = get_lines_from_content(decode_cif_content(content))
+    for block_name, block_content in iter_cif_blocks_from_lines(lines):
+        yield get_block_file_path(file_path, block_name), block_content
+
+
+def is_archive(file_path: str) -> bool:
+    """Check whether the file is a .zip, .tar or .gz archive."""
+    return os.path.isfile(file_path) and file_path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def iter_archive_members(archive_path: str, ext=".cif") -> Iterator[tuple[str, bytes]]:
+    """Yield the path and content of each file with a given extension in
+    a .zip, .tar (optionally compressed) or .gz archive without
+    extracting it to disk.
+
+    Members are read one at a time. The path of a member is named
+    "<archive path>/<member name>", except for a single .gz file, which
+    is named after the archive without the .gz extension.
+
+    Examples
+    --------
+    >>> for file_path, content in iter_archive_members("PCD.tar.gz"):
+    ...     cif = Cif(file_path, content=content)
+    """
+    lowered_path = archive_path.lower()
+    if lowered_path.endswith(".zip"):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.endswith(ext):
+                    yield os.path.join(archive_path, info.filename), archive.read(info)
+    elif lowered_path.endswith(TAR_EXTENSIONS):
+        # Stream mode reads the members sequentially without seeking
+        with tarfile.open(archive_path, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(ext):
+                    content = archive.extractfile(member).read()
+                    yield os.path.join(archive_path, member.name), content
+    elif lowered_path.endswith(".gz"):
+        file_path = archive_path[: -len(".gz")]
+        if file_path.endswith(ext):
+            with gzip.open(archive_path, "rb") as f:
+                yield file_path, f.read()
+    else:
+        raise ValueError(f"{archive_path} is not a .zip, .tar or .gz archive.")
+
+
+def iter_cifs_from_archive(archive_path: str, is_formatted=False, **kwargs) -> Iterator:
+    """Yield a Cif object for each .cif file in an archive.
+
+    Each file is preprocessed in memory and never extracted to disk.
+    Additional keyword arguments are passed to Cif.
+    """
+    # Imported here since the Cif model depends on the utils package
+    from cifkit.models.cif import Cif
+
+    for file_path, content in iter_archive_members(archive_path):
+        yield Cif(file_path, is_formatted=is_formatted, content=content, **kwargs)
@@ -0,0 +1,204 @@
+"""Scan metadata from the raw text of .cif files without gemmi."""
+
+import os
+import re
+from typing import NamedTuple
+
+from cifkit.utils.cif_parser import get_cif_content, get_tag_from_third_line
+from cifkit.utils.cif_sourcer import get_cif_db_source
+from cifkit.utils.folder import get_file_paths
+from cifkit.utils.string_parser import (
+    clean_parsed_structure,
+    get_string_to_formatted_float,
+    strip_numbers_and_symbols,
+    trim_string,
+)
+
+# Split a line into CIF tokens while keeping quoted strings intact
+_TOKEN_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|\S+")
+
+_HEADER_TAGS = {
+    "_chemical_formula_structural",
+    "_chemical_name_structure_type",
+    "_chemical_formula_weight",
+    "_space_group_it_number",
+    "_space_group_name_h-m_alt",
+}
+
+
+class CifHeader(NamedTuple):
+    """Compact metadata record of a .cif file.
+
+    The attribute names match those of ``Cif`` so that a record can be
+    used wherever only formula-level metadata is required.
+    """
+
+    file_path: str
+    file_name: str
+    db_source: str
+    tag: str
+    formula: str
+    structure: str
+    weight: float
+    space_group_number: int
+    space_group_name: str
+    unique_elements: set[str]
+    composition_type: int
+    site_count: int
+
+
+def _tokenize(line: str) -> list[str]:
+    """Split a line into tokens and drop any trailing comment."""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(line):
+        if token.startswith("#"):
+            break
+        tokens.append(token)
+    return tokens
+
+
+def get_header_values_and_atom_site_loop(
+    content: str,
+) -> tuple[dict[str, str], list[str], list[str]]:
+    """Collect the raw header values and the atom site loop in a single
+    pass over the lines of the .cif file content.
+
+    Returns the raw values of the header tags keyed by lowercase tag,
+    the lowercase tags of the atom site loop, and its values in order.
+    """
+    values: dict[str, str] = {}
+    loop_tags: list[str] = []
+    loop_values: list[str] = []
+
+    lines = content.splitlines()
+    in_loop_header = False
+    in_atom_site_loop = False
+    pending_tag = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        i += 1
+
+        # Skip the semicolon text fields, keeping them only as tag values
+        if line.startswith(";"):
+            text_lines = [line]
+            while i < len(lines) and not lines[i].startswith(";"):
+                text_lines.append(lines[i])
+                i += 1
+            if i < len(lines):
+                text_lines.append(lines[i])
+                i += 1
+            if pending_tag is not None:
+                values[pending_tag] = "\n".join(text_lines)
+                pending_tag = None
+            continue
+
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        lowered = stripped.lower()
+        if lowered.startswith("loop_"):
+            in_loop_header = True
+            in_atom_site_loop = False
+            current_loop_tags = []
+            continue
+
+        if lowered.startswith("_"):
+            tokens = _tokenize(stripped)
+            tag = tokens[0].lower()
+            if in_loop_header:
+                current_loop_tags.append(tag)
+                continue
+            in_atom_site_loop = False
+            if tag in _HEADER_TAGS:
+                if len(tokens) > 1:
+                    values[tag] = stripped[len(tokens[0]) :].strip()
+                else:
+                    pending_tag = tag
+            continue
+
+        if lowered.startswith("data_"):
+            in_loop_header = False
+            in_atom_site_loop = False
+            continue
+
+        if in_loop_header:
+            # The first value line closes the loop header
+            in_loop_header = False
+            if "_atom_site_type_symbol" in current_loop_tags and not loop_tags:
+                loop_tags = current_loop_tags
+                in_atom_site_loop = True
+
+        if in_atom_site_loop:
+            loop_values.extend(_tokenize(stripped))
+        elif pending_tag is not None:
+            values[pending_tag] = stripped
+            pending_tag = None
+
+    return values, loop_tags, loop_values
+
+
+def scan_cif_header(content: str, file_path: str = "") -> CifHeader:
+    """Return the metadata record of a .cif file from its text without
+    running a gemmi parse, symmetry expansion or supercell generation.
+
+    Formula, structure, weight and space group are post-processed the
+    same way as in ``cif_parser.get_formula_structure_weight_s_group``.
+    """
+    values, loop_tags, loop_values = get_header_values_and_atom_site_loop(content)
+
+    formula = values.get("_chemical_formula_structural")
+    structure = values.get("_chemical_name_structure_type")
+    weight = values.get("_chemical_formula_weight")
+    s_group_num = values.get("_space_group_it_number")
+    s_group_name = values.get("_space_group_name_h-m_alt")
+
+    unique_elements = set()
+    site_count = 0
+    if loop_tags:
+        column_count = len(loop_tags)
+        type_symbol_index = loop_tags.index("_atom_site_type_symbol")
+        site_count = len(loop_values) // column_count
+        for row in range(site_count):
+            element = loop_values[row * column_count + type_symbol_index]
+            unique_elements.add(strip_numbers_and_symbols(element))
+
+    db_source = get_cif_db_source(file_path, content=content)
+    return CifHeader(
+        file_path=file_path,
+        file_name=os.path.basename(file_path),
+        db_source=db_source,
+        tag=get_tag_from_third_line(file_path, db_source, content=content),
+        formula=trim_string(formula) if formula else None,
+        structure=clean_parsed_structure(structure) if structure else None,
+        weight=get_string_to_formatted_float(weight) if weight else None,
+        space_group_number=int(trim_string(s_group_num)) if s_group_num else None,
+        space_group_name=trim_string(s_group_name) if s_group_name else None,
+        unique_elements=unique_elements,
+        composition_type=len(unique_elements),
+        site_count=site_count,
+    )
+
+
+def scan_cif_file(file_path: str) -> CifHeader:
+    """Return the metadata record of a .cif file."""
+    return scan_cif_header(get_cif_content(file_path), file_path)
+
+
+def scan_cif_files(file_paths: list[str]) -> list[CifHeader]:
+    """Return the metadata records of a list of .cif files."""
+    return [scan_cif_file(file_path) for file_path in file_paths]
+
+
+def scan_cif_dir(dir_path: str, add_nested_files=False) -> list[CifHeader]:
+    """Return the metadata records of all .cif files in a directory.
+
+    Examples
+    --------
+    >>> headers = scan_cif_dir("tests/data/cif/ensemble_test")
+    >>> {header.formula for header in headers}
+    {"EuIr2Ge2", "CeRu2Ge2", "LaRu2Ge2", "Mo"}
+    """
+    file_paths = get_file_paths(dir_path, add_nested_files=add_nested_files)
+    return scan_cif_files(file_paths)
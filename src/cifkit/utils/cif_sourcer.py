@@ -1,23 +1,47 @@
 import os
+import re
 
+# Every known identifier is written in the header of the file
+DB_SOURCE_SEARCH_BYTES = 16384
 
-def get_cif_db_source(file_path):
-    database_identifiers = {
-        "COD": "This file is available in the Crystallography Open Database (COD)",
-        "ICSD": "_database_code_ICSD",
-        "MS": "'Materials Studio'",
-        "PCD": "#_database_code_PCD",
-        "MP": "# generated using pymatgen",
-        "CCDC": "# Cambridge Structural Database (CSD)",
-    }
-
-    if os.path.exists(file_path) and file_path.endswith(".cif"):
-        with open(file_path, "r") as file:
-            file_content = file.readlines()
-            for line in file_content:
-                for db_key, db_search_string in database_identifiers.items():
-                    if db_search_string in line:
-                        return db_key
-            return "Unknown"  # Return "Unknown" if no identifier matched
-    else:
-        return "File does not exist or is not a CIF file"
+DATABASE_IDENTIFIERS = {
+    "COD": "This file is available in the Crystallography Open Database (COD)",
+    "ICSD": "_database_code_ICSD",
+    "MS": "'Materials Studio'",
+    "PCD": "#_database_code_PCD",
+    "MP": "# generated using pymatgen",
+    "CCDC": "# Cambridge Structural Database (CSD)",
+}
+
+# Match all identifiers in a single pass with one named group per database
+_DATABASE_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{db_key}>{re.escape(db_search_string)})"
+        for db_key, db_search_string in DATABASE_IDENTIFIERS.items()
+    )
+)
+
+
+def get_cif_db_source(file_path, content=None, max_bytes=DB_SOURCE_SEARCH_BYTES):
+    """Return the database source of a .cif file.
+
+    Only the first `max_bytes` of the file are searched since every
+    known identifier is located in the header. Set `max_bytes` to None
+    to search the whole file. If the file content has already been read,
+    pass it as `content` (str or bytes) to avoid opening the file again.
+    """
+    if content is None:
+        if not (os.path.exists(file_path) and file_path.endswith(".cif")):
+            return "File does not exist or is not a CIF file"
+        with open(file_path, "rb") as file:
+            content = file.read(max_bytes)
+    elif max_bytes is not None:
+        content = content[:max_bytes]
+
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+
+    match = _DATABASE_PATTERN.search(content)
+    if match is None:
+        return "Unknown"  # Return "Unknown" if no identifier matched
+    return match.lastgroup
@@ -22,6 +22,10 @@ class CifParserError(Enum):
 class FileError(Enum):
     FILE_NOT_FOUND = "The file at {file_path} was not found."
     FILE_IS_EMPTY = "The file at {file_path} is empty."
+    STALE_PACK_INDEX = (
+        "The pack file at {file_path} changed since it was indexed. Pack the files again."
+    )
+    DUPLICATE_PACK_ID = "More than one file has the ID '{cif_id}' in the pack."
 
 
 class OccupancyError(Enum):
@@ -18,7 +18,11 @@ def get_file_count(dir_path: str, ext=".cif") -> int:
 
 def get_file_paths(dir_path: str, ext=".cif", add_nested_files=False) -> list[str]:
     """Return a list of file paths with a given extension from a
-    directory."""
+    directory.
+
+    Compressed files such as .cif.gz do not end with ".cif" and are not
+    returned.
+    """
     if add_nested_files:
         # Traverse through directory and subdirectories
         files_list = []
@@ -0,0 +1,65 @@
+import numpy as np
+
+from cifkit.utils import unit
+
+
+class Lattice:
+    """Lattice of a unit cell with the transformation matrices computed
+    once, to convert many points at a time.
+
+    Attributes
+    ----------
+    lengths : list[float]
+        Unit cell lengths in Angstroms.
+    angles_rad : list[float]
+        Unit cell angles in radians, ordered by alpha, beta, gamma.
+    matrix : np.ndarray
+        Matrix converting fractional to Cartesian coordinates, with the
+        lattice vectors as columns.
+    inverse_matrix : np.ndarray
+        Matrix converting Cartesian to fractional coordinates.
+    metric_tensor : np.ndarray
+        Dot products of the lattice vectors, used to compute distances
+        from fractional coordinates.
+
+    Examples
+    --------
+    >>> lattice = Lattice([6.21, 6.21, 6.21], np.radians([90, 90, 90]))
+    >>> lattice.get_cartesian_coords(np.array([[0.5, 0.5, 0.5]]))
+    array([[3.105, 3.105, 3.105]])
+    """
+
+    def __init__(self, lengths: list[float], angles_rad: list[float]):
+        self.lengths = lengths
+        self.angles_rad = angles_rad
+        self.matrix = unit.get_fractional_to_cartesian_matrix(lengths, angles_rad)
+        self.inverse_matrix = np.linalg.inv(self.matrix)
+        self.metric_tensor = self.matrix.T @ self.matrix
+
+    @property
+    def volume(self) -> float:
+        """Volume of the unit cell in cubic Angstroms."""
+        return float(np.linalg.det(self.matrix))
+
+    def get_cartesian_coords(self, fractional_coords: np.ndarray) -> np.ndarray:
+        """Convert (N, 3) fractional coordinates to Cartesian coordinates.
+
+        Each point is multiplied by the matrix as in
+        `unit.fractional_to_cartesian`, so the results are identical.
+        """
+        return np.matmul(self.matrix, np.asarray(fractional_coords)[..., None])[..., 0]
+
+    def get_fractional_coords(self, cartesian_coords: np.ndarray) -> np.ndarray:
+        """Convert (N, 3) Cartesian coordinates to fractional
+        coordinates."""
+        return np.matmul(self.inverse_matrix, np.asarray(cartesian_coords)[..., None])[
+            ..., 0
+        ]
+
+    def get_distances(
+        self, fractional_coords_1: np.ndarray, fractional_coords_2: np.ndarray
+    ) -> np.ndarray:
+        """Return the distances in Angstroms between pairs of fractional
+        coordinates, using the metric tensor."""
+        diffs = np.asarray(fractional_coords_2) - np.asarray(fractional_coords_1)
+        return np.sqrt(np.einsum("...i,ij,...j->...", diffs, self.metric_tensor, diffs))
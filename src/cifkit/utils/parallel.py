@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+
+def get_worker_count(n_workers: int | None) -> int:
+    """Return the number of worker processes, using all CPUs if None."""
+    if n_workers is None:
+        return os.cpu_count() or 1
+    return max(1, n_workers)
+
+
+def map_in_processes(
+    func: Callable,
+    items: list,
+    n_workers: int | None = 1,
+) -> list[Any]:
+    """Apply a function to each item across a pool of processes and
+    return the results in the order of the items.
+
+    The items are processed in the current process if n_workers is 1 or
+    there is at most one item. Set n_workers to None to use all CPUs. An
+    exception raised for an item is raised again once the results of the
+    items before it have been collected, so errors are reported in the
+    same order as in a sequential run.
+    """
+    n_workers = min(get_worker_count(n_workers), len(items))
+    if n_workers <= 1:
+        return [func(item) for item in items]
+
+    # Send items in chunks to reduce the inter-process communication
+    chunksize = max(1, len(items) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
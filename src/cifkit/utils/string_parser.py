@@ -1,4 +1,7 @@
 import re
+from typing import Iterable
+
+import numpy as np
 
 from cifkit.utils import formula
 from cifkit.utils.error_messages import GeneralError
@@ -30,6 +33,41 @@ def get_string_to_formatted_float(str_value: str) -> float:
     return float(str_value.split("(")[0]) if "(" in str_value else float(str_value)
 
 
+def get_strings_to_floats_and_uncertainties(
+    str_values: Iterable[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert value strings with optional standard uncertainties in
+    parentheses into float arrays in a single pass.
+
+    The uncertainty is scaled to the last digit of the value, e.g.,
+    "7.476(2)" gives 7.476 and 0.002. Values without an uncertainty
+    give NaN.
+    """
+    values = []
+    uncertainties = []
+    for str_value in str_values:
+        number, _, rest = str_value.strip().partition("(")
+        number = number.strip()
+        uncertainty_digits = rest.partition(")")[0].strip()
+        values.append(float(number))
+        if not uncertainty_digits:
+            uncertainties.append(np.nan)
+            continue
+        # Scale by the decimal places of the mantissa and by the exponent
+        mantissa, _, exponent = number.lower().partition("e")
+        power = int(exponent or 0) - len(mantissa.partition(".")[2])
+        # Divide for negative powers to avoid rounding errors, e.g., 3 * 1e-4
+        if power < 0:
+            uncertainties.append(float(uncertainty_digits) / 10.0**-power)
+        else:
+            uncertainties.append(float(uncertainty_digits) * 10.0**power)
+
+    return (
+        np.array(values, dtype=np.float64),
+        np.array(uncertainties, dtype=np.float64),
+    )
+
+
 def trim_string(formula: str) -> str:
     """Remove "~", " ", and "'" characters from the parsed formula."""
     return formula.replace("~", "").replace(" ", "").replace("'", "")
@@ -13,13 +13,12 @@ def round_float(distance: float, precision: int = 3) -> float:
     return round(distance, precision)
 
 
-def fractional_to_cartesian(
-    fractional_coords: list[float],
+def get_fractional_to_cartesian_matrix(
     cell_lengths: list[float],
     cell_angles_rad: list[float],
-) -> list[float]:
-    """Convert fractional coordinates to Cartesian coordinates using
-    cell lengths and angles."""
+) -> np.ndarray:
+    """Return the matrix converting fractional to Cartesian coordinates,
+    with the lattice vectors as columns."""
     alpha, beta, gamma = cell_angles_rad
 
     # Calculate the components of the transformation matrix
@@ -44,7 +43,7 @@ def fractional_to_cartesian(
     )
 
     # Transformation matrix from fractional to Cartesian coordinates
-    matrix = np.array(
+    return np.array(
         [
             [a, b * cos_gamma, c * cos_beta],
             [
@@ -56,11 +55,30 @@ def fractional_to_cartesian(
         ]
     )
 
+
+def fractional_to_cartesian(
+    fractional_coords: list[float],
+    cell_lengths: list[float],
+    cell_angles_rad: list[float],
+) -> list[float]:
+    """Convert fractional coordinates to Cartesian coordinates using
+    cell lengths and angles."""
+    matrix = get_fractional_to_cartesian_matrix(cell_lengths, cell_angles_rad)
     cartesian_coords = np.dot(matrix, fractional_coords).flatten()
 
     return cartesian_coords
 
 
+def get_interplanar_spacings(
+    cell_lengths: list[float],
+    cell_angles_rad: list[float],
+) -> np.ndarray:
+    """Return the spacings of the (100), (010) and (001) lattice planes,
+    i.e., the heights of the unit cell along each axis."""
+    matrix = get_fractional_to_cartesian_matrix(cell_lengths, cell_angles_rad)
+    return 1 / np.linalg.norm(np.linalg.inv(matrix), axis=1)
+
+
 def round_dict_values(dict, precision=3):
     if dict is None:
         return None
@@ -197,6 +197,7 @@ def radius_sum_data_URhIn() -> dict:
 
 @pytest.fixture(scope="module")
 def cif_URhIn(file_path_URhIn):
+    # supercell_size sets the supercell points, not the connections
     return Cif(file_path_URhIn, supercell_size=2)
 
 
@@ -1,3 +1,4 @@
+import gzip
 import logging
 import os
 import shutil
@@ -6,6 +7,9 @@ import pytest
 from deepdiff import DeepDiff
 
 from cifkit import Cif
+from cifkit.preprocessors.environment import get_site_connections
+from cifkit.preprocessors.supercell import get_supercell_points_from_unitcell
+from cifkit.preprocessors.supercell_util import get_supercell_extents
 from cifkit.utils.error_messages import CifParserError
 
 
@@ -185,7 +189,22 @@ def test_shortest_distance_computation():
 @pytest.mark.fast
 def test_connections_flattened(cif_URhIn):
     assert cif_URhIn.connections_flattened[0] == (("In", "Rh"), 2.697)
-    assert len(cif_URhIn.connections_flattened) == 621
+    # Connections cover the cutoff radius whatever the supercell_size of the
+    # Cif, as searched in the supercell sized from the cutoff extents
+    extents = get_supercell_extents(
+        10.0, cif_URhIn.unitcell_lengths, cif_URhIn.unitcell_angles
+    )
+    connections = get_site_connections(
+        [cif_URhIn.site_labels, cif_URhIn.unitcell_lengths, cif_URhIn.unitcell_angles],
+        cif_URhIn.unitcell_points,
+        get_supercell_points_from_unitcell(cif_URhIn.unitcell_points, extents),
+        cutoff_radius=10.0,
+        neighbor_search="brute",
+    )
+    assert cif_URhIn.connections == connections
+    assert len(cif_URhIn.connections_flattened) == sum(
+        len(site_connections) for site_connections in connections.values()
+    )
 
 
 @pytest.mark.fast
@@ -664,3 +683,67 @@ def test_init_cif_file(
     assert cif.db_source == expected_db_source
     assert cif.unique_elements == expected_elements
     assert cif.supercell_atom_count == expected_atom_count
+
+
+@pytest.mark.fast
+def test_init_from_content():
+    with open("tests/data/cifs/CUMNON01_sb_only.cif", "rb") as f:
+        content = f.read()
+    cif_from_bytes = Cif("archive/CUMNON01_sb_only.cif", content=content)
+    cif_from_str = Cif("archive/CUMNON01_sb_only.cif", content=content.decode())
+    cif_from_file = Cif("tests/data/cifs/CUMNON01_sb_only.cif")
+
+    for cif in [cif_from_bytes, cif_from_str]:
+        assert cif.file_name == "CUMNON01_sb_only.cif"
+        assert cif.db_source == cif_from_file.db_source
+        assert cif.site_labels == cif_from_file.site_labels
+        assert cif.unitcell_lengths == cif_from_file.unitcell_lengths
+        assert cif.supercell_atom_count == cif_from_file.supercell_atom_count
+
+
+@pytest.mark.fast
+def test_init_from_gzip_file(tmp_path):
+    gz_file_path = str(tmp_path / "CUMNON01_sb_only.cif.gz")
+    with open("tests/data/cifs/CUMNON01_sb_only.cif", "rb") as f:
+        content = f.read()
+    with gzip.open(gz_file_path, "wb") as f:
+        f.write(content)
+
+    cif = Cif(gz_file_path)
+    assert cif.db_source == "CCDC"
+    assert cif.site_labels == Cif("tests/data/cifs/CUMNON01_sb_only.cif").site_labels
+    # The compressed file is preprocessed in memory only
+    with gzip.open(gz_file_path, "rb") as f:
+        assert f.read() == content
+
+
+@pytest.mark.fast
+def test_init_supercell_extents():
+    file_path = "tests/data/cifs/CUMNON01_sb_only.cif"
+    # 2 atoms in the unit cell, shifted by -1, 0 and 1 along a
+    assert Cif(file_path, supercell_size=(1, 0, 0)).supercell_atom_count == 6
+    # The cell lengths are 8.1 to 10.0 Å, so ±2 shifts cover 10 Å
+    assert Cif(file_path, supercell_size="auto").supercell_atom_count == 250
+
+
+@pytest.mark.fast
+def test_lazy_geometry():
+    cif = Cif("tests/data/cifs/CUMNON01_sb_only.cif")
+    assert cif._supercell_points is None
+    assert cif._supercell_points_for_plotting is None
+    # Counted without holding on to the supercell
+    assert cif.supercell_atom_count == 250
+    assert cif._supercell_points is None
+
+    supercell_points = cif.supercell_points
+    assert len(supercell_points) == 250
+    assert cif.supercell_points is supercell_points
+    unitcell_points_for_plotting = cif.unitcell_points_for_plotting
+    assert len(unitcell_points_for_plotting) >= cif.unitcell_atom_count
+
+    cif.release_geometry()
+    assert cif._supercell_points is None
+    assert cif._unitcell_points_for_plotting is None
+    assert cif.supercell_atom_count == 250
+    assert list(cif.supercell_points) == list(supercell_points)
+    assert list(cif.unitcell_points_for_plotting) == list(unitcell_points_for_plotting)
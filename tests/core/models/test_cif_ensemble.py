@@ -1,11 +1,13 @@
 import logging
 import os
 import shutil
+import zipfile
 from pathlib import Path
 
 import pytest
 
-from cifkit import CifEnsemble
+from cifkit import CifEnsemble, Example
+from cifkit.utils.cif_index import pack_cif_files
 from cifkit.utils.folder import copy_files, get_file_count, get_file_paths
 
 
@@ -55,7 +57,9 @@ def test_unique_values(cif_ensemble_test: CifEnsemble):
 
 
 @pytest.mark.fast
-def test_distances_supercell_size(cif_ensemble_test: CifEnsemble):
+def test_minimum_distances_and_supercell_atom_counts(cif_ensemble_test: CifEnsemble):
+    # Minimum distances are found within the cutoff radius whatever the
+    # supercell_size, while the atom counts are of the ±1 supercell
     expected_minimum_distances = set(
         [
             ("tests/data/cif/ensemble_test/300169.cif", 2.29),
@@ -495,3 +499,131 @@ def test_init_cif_files(
     ensemble = CifEnsemble(tmpdir, supercell_size=2)
     assert ensemble.file_count == expected_file_count
     assert ensemble.supercell_size_stats == expected_supercell_stats
+
+
+@pytest.mark.fast
+def test_init_metadata_only():
+    ensemble = CifEnsemble(
+        Example.demo_cif_folder_path, preprocess=False, metadata_only=True
+    )
+    assert ensemble.file_count == 2
+    assert ensemble.unique_formulas == {"GdSb", "HoSb"}
+    assert ensemble.unique_elements == {"Gd", "Ho", "Sb"}
+    assert ensemble.structure_stats == {"NaCl": 2}
+    assert ensemble.filter_by_elements_containing(["Ho"]) == {
+        Example.GdSb_file_path.replace("GdSb", "HoSb")
+    }
+
+
+@pytest.mark.fast
+def test_init_multi_block(tmp_path):
+    with open(Example.GdSb_file_path, "r") as f:
+        GdSb_content = f.read()
+    with open(Example.GdSb_file_path.replace("GdSb", "HoSb"), "r") as f:
+        HoSb_content = f.read()
+    (tmp_path / "bulk.cif").write_text(GdSb_content + HoSb_content)
+    # Duplicate labels are recorded in the manifest instead of moved
+    (tmp_path / "error.cif").write_text(GdSb_content.replace(" Gd Gd 4 a", " Sb Sb 4 a"))
+
+    ensemble = CifEnsemble(str(tmp_path), multi_block=True, supercell_size=1)
+    assert ensemble.file_count == 2
+    assert ensemble.unique_formulas == {"GdSb", "HoSb"}
+    assert ensemble.error_manifest == {
+        str(tmp_path / "error.cif" / "260569.cif"): "error_duplicate_labels"
+    }
+    assert sorted(os.listdir(tmp_path)) == ["bulk.cif", "error.cif"]
+
+
+@pytest.mark.fast
+def test_init_archive(tmp_path):
+    with open(Example.GdSb_file_path, "r") as f:
+        GdSb_content = f.read()
+    archive_path = tmp_path / "cifs.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("GdSb.cif", GdSb_content)
+        archive.writestr("error.cif", GdSb_content.replace(" Gd Gd 4 a", " Sb Sb 4 a"))
+
+    ensemble = CifEnsemble(str(archive_path), supercell_size=1)
+    assert ensemble.file_paths == [str(archive_path / "GdSb.cif")]
+    assert ensemble.unique_formulas == {"GdSb"}
+    assert ensemble.error_manifest == {
+        str(archive_path / "error.cif"): "error_duplicate_labels"
+    }
+    # Nothing is extracted or moved
+    assert os.listdir(tmp_path) == ["cifs.zip"]
+
+
+@pytest.mark.fast
+def test_init_pack(tmp_path):
+    pack_path = str(tmp_path / "pack.cif")
+    pack_cif_files(
+        [Example.GdSb_file_path, Example.GdSb_file_path.replace("GdSb", "HoSb")],
+        pack_path,
+    )
+
+    ensemble = CifEnsemble(pack_path, supercell_size=1)
+    assert ensemble.file_count == 2
+    assert ensemble.get_cif("HoSb").formula == "HoSb"
+    with pytest.raises(KeyError):
+        ensemble.get_cif("LaSb")
+
+    ensemble = CifEnsemble(pack_path, supercell_size=1, cif_ids=["GdSb"])
+    assert ensemble.unique_formulas == {"GdSb"}
+
+
+@pytest.mark.fast
+def test_init_with_journal(tmp_path, capsys):
+    shutil.copy(Example.GdSb_file_path, tmp_path)
+    shutil.copy(Example.GdSb_file_path.replace("GdSb", "HoSb"), tmp_path)
+
+    CifEnsemble(str(tmp_path), supercell_size=1)
+    assert capsys.readouterr().out.count("\nPreprocessing ") == 2
+
+    # Unchanged files that were clean are skipped
+    shutil.copy(Example.GdSb_file_path, tmp_path / "GdSb_copy.cif")
+    ensemble = CifEnsemble(str(tmp_path), supercell_size=1)
+    assert capsys.readouterr().out.count("\nPreprocessing ") == 1
+    assert ensemble.file_count == 3
+
+    CifEnsemble(str(tmp_path), supercell_size=1, use_journal=False)
+    assert capsys.readouterr().out.count("\nPreprocessing ") == 3
+
+
+@pytest.mark.fast
+def test_init_with_workers(tmp_path, capsys):
+    with open(Example.GdSb_file_path, "r") as f:
+        GdSb_content = f.read()
+    for i in range(4):
+        (tmp_path / f"GdSb_{i}.cif").write_text(GdSb_content)
+    for i in [1, 3]:
+        (tmp_path / f"GdSb_{i}.cif").write_text(
+            GdSb_content.replace("_space_group_symop_operation_xyz", "_symop_xyz")
+        )
+
+    ensemble = CifEnsemble(str(tmp_path), supercell_size=1, n_workers=2, quiet=True)
+    assert ensemble.file_count == 2
+    assert sorted(os.listdir(tmp_path / "error_operations")) == [
+        "GdSb_1.cif",
+        "GdSb_3.cif",
+    ]
+    out = capsys.readouterr().out
+    assert "\nPreprocessing " not in out
+    assert "# of files moved to 'error_operations' folder: 2" in out
+
+
+@pytest.mark.fast
+def test_init_without_moving_error_files(tmp_path):
+    with open(Example.GdSb_file_path, "r") as f:
+        GdSb_content = f.read()
+    (tmp_path / "GdSb.cif").write_text(GdSb_content)
+    (tmp_path / "GdSb_no_symop.cif").write_text(
+        GdSb_content.replace("_space_group_symop_operation_xyz", "_symop_xyz")
+    )
+
+    ensemble = CifEnsemble(str(tmp_path), supercell_size=1, move_error_files=False)
+    assert ensemble.file_count == 1
+    assert ensemble.error_manifest == {
+        str(tmp_path / "GdSb_no_symop.cif"): "error_operations"
+    }
+    assert not os.path.exists(tmp_path / "error_operations")
+    assert os.path.exists(tmp_path / "GdSb_no_symop.cif")
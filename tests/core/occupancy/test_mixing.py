@@ -1,6 +1,6 @@
 import pytest
 
-from cifkit import Cif
+from cifkit import Cif, Example
 from cifkit.occupancy.mixing import (
     compute_coord_occupancy_sum,
     frac_coordinates,
@@ -217,3 +217,21 @@ def test_get_atom_site_mixing_dict_5():
     assert data[("Fe1A", "Si1")] == "deficiency_with_atomic_mixing"
     assert data[("Si1", "Si1B")] == "deficiency_with_atomic_mixing"
     assert data[("Fe1A", "Si1B")] == "deficiency_with_atomic_mixing"
+
+
+@pytest.mark.fast
+def test_mixing_from_atom_site_table():
+    cif = Cif(Example.GdSb_file_path)
+    for atom_site_info in [cif.atom_site_info, cif.atom_site_table]:
+        assert compute_coord_occupancy_sum(cif.site_labels, atom_site_info) == {
+            (0.5, 0.5, 0.5): 1.0,
+            (0.0, 0.0, 0.0): 1.0,
+        }
+        assert get_site_mixing_type(cif.site_labels, atom_site_info) == "full_occupancy"
+        assert get_mixing_type_per_pair_dict(
+            cif.site_labels, cif.site_label_pairs, atom_site_info
+        ) == {
+            ("Gd", "Gd"): "full_occupancy",
+            ("Gd", "Sb"): "full_occupancy",
+            ("Sb", "Sb"): "full_occupancy",
+        }
@@ -1,7 +1,18 @@
 import numpy as np
 import pytest
 
-from cifkit.preprocessors.environment import remove_duplicate_connections
+from cifkit import Cif, Example
+from cifkit.preprocessors.environment import (
+    NEIGHBOR_SEARCH_METHODS,
+    get_nearest_dists_per_point,
+    get_periodic_nearest_dists_per_point,
+    get_points_coords_and_labels,
+    get_site_connections,
+    remove_duplicate_connections,
+)
+from cifkit.preprocessors.supercell import CellPoints, get_supercell_points_from_unitcell
+from cifkit.preprocessors.supercell_util import get_supercell_extents
+from cifkit.utils.lattice import Lattice
 
 
 def assert_minimum_distance(label, connections_dict, expected_min_distance):
@@ -60,3 +71,111 @@ def test_remove_duplicate_connections():
             ("OsM2", 2.618, [1.33, -0.768, 1.06], [0.0, -1.536, 3.18]),
         ],
     }
+
+
+@pytest.mark.fast
+def test_get_site_connections_neighbor_search():
+    cif = Cif(Example.GdSb_file_path)
+    parsed_data = [cif.site_labels, cif.unitcell_lengths, cif.unitcell_angles]
+    supercell_points = cif.supercell_points
+    connections = {
+        method: get_site_connections(
+            parsed_data,
+            cif.unitcell_points,
+            supercell_points,
+            cutoff_radius=10.0,
+            neighbor_search=method,
+        )
+        for method in NEIGHBOR_SEARCH_METHODS
+    }
+    # Every method gives identical connections
+    for method in NEIGHBOR_SEARCH_METHODS:
+        assert connections[method] == connections["brute"]
+    assert len(connections["kdtree"]["Gd"]) > 0
+
+    with pytest.raises(ValueError):
+        get_site_connections(
+            parsed_data,
+            cif.unitcell_points,
+            supercell_points,
+            cutoff_radius=10.0,
+            neighbor_search="unknown",
+        )
+
+
+@pytest.mark.fast
+def test_get_site_connections_default_neighbor_search():
+    cif = Cif(Example.GdSb_file_path)
+    parsed_data = [cif.site_labels, cif.unitcell_lengths, cif.unitcell_angles]
+    # The ±1 supercell misses neighbors within the cutoff radius
+    supercell_points = get_supercell_points_from_unitcell(cif.unitcell_points, 1)
+
+    def get_connections(supercell_points, **kwargs):
+        return get_site_connections(
+            parsed_data, cif.unitcell_points, supercell_points, 10.0, **kwargs
+        )
+
+    # A given supercell is searched rather than ignored
+    connections = get_connections(supercell_points)
+    assert connections == get_connections(supercell_points, neighbor_search="brute")
+    assert connections != get_connections(None, neighbor_search="periodic")
+    # Without a supercell, the unit cell is translated by the lattice vectors
+    assert get_connections(None) == get_connections(None, neighbor_search="periodic")
+
+
+@pytest.mark.fast
+def test_get_periodic_nearest_dists_per_point_triclinic():
+    lengths = [4.1, 5.3, 6.2]
+    angles_rad = np.radians([72.0, 104.0, 95.0]).tolist()
+    lattice = Lattice(lengths, angles_rad)
+    # The point at 1.0 is removed from the supercell where it coincides
+    # with the translated point at 0.0
+    unitcell_points = CellPoints(
+        np.array([[0.0, 0.1, 0.2], [0.5, 0.25, 0.75], [1.0, 0.1, 0.2]]),
+        np.array([0, 1, 0], dtype=np.int32),
+        ["A", "B"],
+    )
+    cutoff_radius = 7.5
+    supercell_points = get_supercell_points_from_unitcell(
+        unitcell_points, get_supercell_extents(cutoff_radius, lengths, angles_rad)
+    )
+    unitcell_coords, unitcell_labels = get_points_coords_and_labels(unitcell_points)
+    supercell_coords, supercell_labels = get_points_coords_and_labels(supercell_points)
+    points_cart = lattice.get_cartesian_coords(unitcell_coords)
+
+    expected = get_nearest_dists_per_point(
+        points_cart,
+        lattice.get_cartesian_coords(supercell_coords),
+        supercell_labels,
+        cutoff_radius,
+    )
+    assert (
+        get_periodic_nearest_dists_per_point(
+            points_cart, unitcell_coords, unitcell_labels, cutoff_radius, lattice
+        )
+        == expected
+    )
+
+
+@pytest.mark.fast
+def test_get_site_connections_representative():
+    cif = Cif(Example.GdSb_file_path)
+    parsed_data = [cif.site_labels, cif.unitcell_lengths, cif.unitcell_angles]
+    connections = get_site_connections(
+        parsed_data, cif.unitcell_points, None, 10.0, neighbor_search="periodic"
+    )
+    representative_connections = get_site_connections(
+        parsed_data,
+        cif.unitcell_points,
+        None,
+        10.0,
+        neighbor_search="periodic",
+        site_strategy="representative",
+    )
+    # Symmetry-equivalent points have the same neighbors
+    assert representative_connections == connections
+
+    with pytest.raises(ValueError):
+        get_site_connections(
+            parsed_data, cif.unitcell_points, None, 10.0, site_strategy="unknown"
+        )
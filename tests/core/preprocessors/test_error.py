@@ -3,7 +3,14 @@ import shutil
 
 import pytest
 
-from cifkit.preprocessors.error import move_files_based_on_errors
+from cifkit import Cif, Example
+from cifkit.preprocessors.error import (
+    get_error_type,
+    get_file_error,
+    move_files_based_on_errors,
+)
+from cifkit.preprocessors.validator import validate_cif_content
+from cifkit.utils.cif_parser import get_cif_content
 from cifkit.utils.folder import get_file_count, get_file_paths
 
 
@@ -32,3 +39,68 @@ def test_move_files_based_on_errors(tmpdir):
     # Assert the number of files in eoach directory
     assert get_file_count(expected_dirs["error_duplicate_labels"]) == 1
     assert get_file_count(expected_dirs["error_invalid_label"]) == 1
+
+
+def _write_GdSb_without_symop_loop(file_path):
+    with open(Example.GdSb_file_path, "r") as f:
+        content = f.read()
+    with open(file_path, "w") as f:
+        f.write(content.replace("_space_group_symop_operation_xyz", "_symop_xyz"))
+
+
+@pytest.mark.fast
+def test_get_file_error(tmp_path):
+    assert get_file_error(Example.GdSb_file_path) is None
+
+    file_path = str(tmp_path / "GdSb.cif")
+    _write_GdSb_without_symop_loop(file_path)
+    error_type, error_message = get_file_error(file_path)
+
+    # Same category as when the supercell is generated by a full load
+    with pytest.raises(Exception) as e:
+        Cif(file_path, is_formatted=True)
+    assert error_type == get_error_type(str(e.value)) == "error_operations"
+    assert error_message == str(e.value)
+
+
+@pytest.mark.fast
+def test_validate_cif_content_without_cif(monkeypatch):
+    def raise_error(*args, **kwargs):
+        raise AssertionError("A Cif object was initialized")
+
+    # Only the checks are run, without initializing a Cif object
+    monkeypatch.setattr(Cif, "__init__", raise_error)
+    content = get_cif_content(Example.GdSb_file_path)
+    assert validate_cif_content(content, Example.GdSb_file_path) == content
+
+
+@pytest.mark.fast
+def test_get_file_error_missing_coordinates(tmp_path):
+    file_path = str(tmp_path / "GdSb.cif")
+    with open(Example.GdSb_file_path, "r") as f:
+        content = f.read()
+    with open(file_path, "w") as f:
+        f.write(
+            content.replace(" _atom_site_occupancy\n", "")
+            .replace(" 0.5 0.5 0.5 1\n", " 0.5 0.5 0.5\n")
+            .replace(" 0 0 0 1\n", " 0 0 0\n")
+        )
+
+    error_type, error_message = get_file_error(file_path)
+    assert error_type == "error_coords"
+    assert error_message == "Missing atomic coordinates"
+
+
+@pytest.mark.fast
+def test_move_files_based_on_errors_manifest_only(tmp_path, capsys):
+    file_path = str(tmp_path / "GdSb.cif")
+    _write_GdSb_without_symop_loop(file_path)
+    error_types = move_files_based_on_errors(
+        str(tmp_path), [file_path, Example.GdSb_file_path], manifest_only=True
+    )
+
+    assert error_types == {file_path: "error_operations"}
+    assert os.listdir(tmp_path) == ["GdSb.cif"]
+    out = capsys.readouterr().out
+    assert "File GdSb.cif flagged as 'error_operations' due to:" in out
+    assert "# of files flagged as 'error_operations': 1" in out
@@ -4,7 +4,13 @@ import tempfile
 
 import pytest
 
-from cifkit.preprocessors.format import preprocess_label_element_loop_values
+from cifkit import Example
+from cifkit.preprocessors.format import (
+    get_label_shape,
+    normalize_site_labels_in_content,
+    preprocess_label_element_loop_values,
+    preprocess_label_element_loop_values_in_files,
+)
 from cifkit.utils import cif_parser, folder, string_parser
 
 
@@ -167,3 +173,44 @@ def test_preprocess_cif_file_on_label_element_type_mixed():
             assert lines[2].strip() == "SnA Sn 4 c 0.0983 0.25 0.6419 1"
 
     shutil.rmtree(temp_dir)
+
+
+@pytest.mark.fast
+def test_get_label_shape():
+    assert get_label_shape("M1A") == "ADA"
+    assert get_label_shape("In1,Co3B") == "AADXAADA"
+
+
+@pytest.mark.fast
+def test_normalize_site_labels_in_content():
+    with open(Example.GdSb_file_path, "r") as f:
+        content = f.read()
+    assert normalize_site_labels_in_content(content) == (content, {})
+
+    content = content.replace(" Sb Sb 4 b", " M1 Sb 4 b")
+    content = content.replace(" Gd Gd 4 a", " Gdd Gd 4 a")
+    modified_content, fired_rules = normalize_site_labels_in_content(content)
+    assert fired_rules == {"M1": ["type_1"], "Gdd": ["type_9"]}
+    lines = cif_parser.get_line_content_from_tag(
+        None, "_atom_site_occupancy", lines=modified_content.splitlines(keepends=True)
+    )
+    assert lines == ["SbM1 Sb 4 b 0.5 0.5 0.5 1\n", "GdD Gd 4 a 0 0 0 1\n"]
+
+
+@pytest.mark.fast
+def test_preprocess_label_element_loop_values_in_files(tmp_path):
+    with open(Example.GdSb_file_path, "r") as f:
+        content = f.read()
+    file_path = str(tmp_path / "GdSb.cif")
+    formatted_file_path = str(tmp_path / "formatted.cif")
+    with open(file_path, "w") as f:
+        f.write(content.replace(" Sb Sb 4 b", " R Sb 4 b"))
+    with open(formatted_file_path, "w") as f:
+        f.write(content)
+
+    fired_rules_per_file = preprocess_label_element_loop_values_in_files(
+        [file_path, formatted_file_path]
+    )
+    assert fired_rules_per_file == {file_path: {"R": ["type_3"]}}
+    with open(file_path, "r") as f:
+        assert "Sb Sb 4 b 0.5 0.5 0.5 1\n" in f.read()
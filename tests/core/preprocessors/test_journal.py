@@ -0,0 +1,64 @@
+import os
+import shutil
+
+import pytest
+
+from cifkit import Example
+from cifkit.preprocessors.journal import (
+    JOURNAL_FILE_NAME,
+    PreprocessingJournal,
+    get_file_hash,
+)
+
+
+@pytest.fixture
+def cif_dir_path(tmp_path):
+    shutil.copy(Example.GdSb_file_path, tmp_path)
+    shutil.copy(Example.GdSb_file_path.replace("GdSb", "HoSb"), tmp_path)
+    return str(tmp_path)
+
+
+@pytest.mark.fast
+def test_preprocessing_journal(cif_dir_path):
+    GdSb_file_path = os.path.join(cif_dir_path, "GdSb.cif")
+    HoSb_file_path = os.path.join(cif_dir_path, "HoSb.cif")
+    file_paths = [GdSb_file_path, HoSb_file_path]
+
+    journal = PreprocessingJournal(cif_dir_path)
+    assert journal.get_pending_file_paths(file_paths) == file_paths
+    journal.record_outcomes(file_paths, {HoSb_file_path: "error_duplicate_labels"})
+    journal.save()
+    assert os.path.exists(os.path.join(cif_dir_path, JOURNAL_FILE_NAME))
+
+    journal = PreprocessingJournal(cif_dir_path)
+    assert journal.entries["GdSb.cif"]["sha256"] == get_file_hash(GdSb_file_path)
+    assert journal.entries["HoSb.cif"]["outcome"] == "error_duplicate_labels"
+    # Files with an error are preprocessed again
+    assert journal.get_pending_file_paths(file_paths) == [HoSb_file_path]
+
+    # The content is compared once the modification time changes
+    os.utime(GdSb_file_path, ns=(0, 0))
+    assert journal.get_pending_file_paths(file_paths) == [HoSb_file_path]
+    with open(GdSb_file_path, "a") as f:
+        f.write("\n")
+    assert journal.get_pending_file_paths(file_paths) == file_paths
+
+
+@pytest.mark.fast
+def test_preprocessing_journal_unreadable(cif_dir_path):
+    GdSb_file_path = os.path.join(cif_dir_path, "GdSb.cif")
+    journal_path = os.path.join(cif_dir_path, JOURNAL_FILE_NAME)
+    with open(journal_path, "w") as f:
+        f.write('{"GdSb.cif": {"outcome"')
+
+    # A corrupt journal is treated as empty
+    journal = PreprocessingJournal(cif_dir_path)
+    assert journal.entries == {}
+    assert journal.get_pending_file_paths([GdSb_file_path]) == [GdSb_file_path]
+
+    # The journal is kept in memory if it cannot be written
+    journal.journal_path = os.path.join(cif_dir_path, "missing_dir", JOURNAL_FILE_NAME)
+    journal.record_outcomes([GdSb_file_path], {})
+    journal.save()
+    assert journal.is_modified
+    assert journal.get_pending_file_paths([GdSb_file_path]) == []
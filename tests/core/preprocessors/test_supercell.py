@@ -1,5 +1,25 @@
-from cifkit import Cif
-from cifkit.preprocessors.supercell import get_supercell_points
+import gemmi
+import numpy as np
+import pytest
+
+from cifkit import Cif, Example
+from cifkit.preprocessors.supercell import (
+    CellPoints,
+    SymmetryOperationsCache,
+    apply_symmetry_operations,
+    find_symmetry_operations,
+    flatten_original_coordinates,
+    get_points_for_plotting,
+    get_supercell_points,
+    get_supercell_points_from_unitcell,
+    get_symmetry_operations,
+    get_unitcell_coords_after_sym_operations_per_label,
+    get_unitcell_coords_for_all_labels,
+    get_unitcell_points,
+    normalize_symmetry_operation,
+    shift_and_append_points,
+)
+from cifkit.utils.cif_parser import get_cif_block
 
 
 def test_cif_short_dist(cif_CUMNON_sb: Cif):
@@ -16,3 +36,135 @@ def test_get_supercell_points_full_shift(cif_block_URhIn):
     # +-1 +-1 +-1 shifts
     supercell_points = get_supercell_points(cif_block_URhIn, 2)
     assert len(supercell_points) == 336
+
+
+@pytest.mark.fast
+def test_get_supercell_points_array():
+    block = get_cif_block(Example.GdSb_file_path)
+    supercell_points = get_supercell_points(block, 2)
+    assert isinstance(supercell_points, CellPoints)
+    assert supercell_points.coords.shape == (len(supercell_points), 3)
+    assert supercell_points.site_indices.dtype == np.int32
+    assert supercell_points.site_labels == ["Sb", "Gd"]
+
+    # Unique points, in the same order in every run
+    points = list(supercell_points)
+    assert len(set(points)) == len(points)
+    assert points == list(get_supercell_points(block, 2))
+    assert points[0] == (-0.5, -0.5, -0.5, "Sb")
+    assert supercell_points[-1] == points[-1]
+    assert isinstance(supercell_points[1:3], CellPoints)
+    assert list(supercell_points[1:3]) == points[1:3]
+    assert supercell_points.get_site_coords("Gd").shape == (len(points) // 2, 3)
+
+    # Equal to the same tuples in the same order
+    assert supercell_points == points
+    assert supercell_points == get_supercell_points(block, 2)
+    assert supercell_points[1:3] == [list(point) for point in points[1:3]]
+    assert supercell_points != points[::-1]
+    assert supercell_points != 0
+    assert supercell_points != list(range(len(points)))
+
+
+@pytest.mark.fast
+def test_deprecated_point_helpers():
+    block = get_cif_block(Example.GdSb_file_path)
+    unitcell_points = get_unitcell_points(block)
+    with pytest.deprecated_call():
+        coords = flatten_original_coordinates(list(unitcell_points))
+    np.testing.assert_array_equal(coords, unitcell_points.coords)
+
+    with pytest.deprecated_call():
+        points = shift_and_append_points(coords[:1], "Sb", 2)
+    assert len(points) == 27
+    assert points[0] == (*(coords[0] - 1).tolist(), "Sb")
+
+    with pytest.deprecated_call():
+        points = get_unitcell_coords_after_sym_operations_per_label(
+            block, unitcell_points[0][:3], "Sb"
+        )
+    assert sorted(points) == sorted(
+        point for point in unitcell_points if point[3] == "Sb"
+    )
+
+
+@pytest.mark.fast
+def test_get_symmetry_operations():
+    block = get_cif_block(Example.GdSb_file_path)
+    symmetry_operations = get_symmetry_operations(block)
+    # Fm-3m
+    assert symmetry_operations.shape == (192, 3, 4)
+    # Compiled once and shared
+    assert get_symmetry_operations(block) is symmetry_operations
+    assert not symmetry_operations.flags.writeable
+
+    # Same coordinates as applying each operation with gemmi
+    fracs = (0.1, 0.2, 0.766325)
+    coords = apply_symmetry_operations(symmetry_operations, np.array([fracs]))[0]
+    for operation, coord in zip(find_symmetry_operations(block), coords.tolist()):
+        expected = gemmi.Op(operation.replace("'", "")).apply_to_xyz(list(fracs))
+        assert coord == [round(value % 1, 5) for value in expected]
+
+
+@pytest.mark.fast
+def test_get_unitcell_coords_for_all_labels():
+    block = get_cif_block(Example.GdSb_file_path)
+    coords_list = get_unitcell_coords_for_all_labels(block)
+    assert [len(coords) for coords in coords_list] == [4, 4]
+    assert (0.0, 0.5, 0.5, "Gd") in coords_list[1]
+
+
+@pytest.mark.fast
+def test_normalize_symmetry_operation():
+    assert normalize_symmetry_operation("'X, Y, Z+1/2'") == "x,y,z+1/2"
+
+
+@pytest.mark.fast
+def test_symmetry_operations_cache():
+    cache = SymmetryOperationsCache(max_size=2)
+    inversion = cache.get(("x,y,z", "-x,-y,-z"))
+    assert inversion.tolist() == [
+        [[24, 0, 0, 0], [0, 24, 0, 0], [0, 0, 24, 0]],
+        [[-24, 0, 0, 0], [0, -24, 0, 0], [0, 0, -24, 0]],
+    ]
+    cache.get(("x,y,z",))
+    assert cache.get(("x,y,z", "-x,-y,-z")) is inversion
+
+    # The least recently used set is evicted
+    cache.get(("x,y,z+1/2",))
+    assert cache.operation_sets == [("x,y,z", "-x,-y,-z"), ("x,y,z+1/2",)]
+
+
+@pytest.mark.fast
+def test_get_supercell_points_from_unitcell():
+    block = get_cif_block(Example.GdSb_file_path)
+    unitcell_points = get_unitcell_points(block)
+    assert list(unitcell_points) == list(get_supercell_points(block, 1))
+    for supercell_size in [2, 3, (1, 0, 2)]:
+        assert list(
+            get_supercell_points_from_unitcell(unitcell_points, supercell_size)
+        ) == list(get_supercell_points(block, supercell_size))
+
+
+@pytest.mark.fast
+def test_get_points_for_plotting():
+    points = CellPoints(
+        np.array([[0.0, 0.0, 0.0], [0.5, 1.0, 0.25], [0.5, 0.5, 0.5]]),
+        np.array([0, 1, 1], dtype=np.int32),
+        ["Gd", "Sb"],
+    )
+    points_for_plotting = list(get_points_for_plotting(points))
+    # The corner atom appears at all 8 corners and the face atom on both faces
+    assert points_for_plotting == [
+        (0.0, 0.0, 0.0, "Gd"),
+        (0.0, 0.0, 1.0, "Gd"),
+        (0.0, 1.0, 0.0, "Gd"),
+        (0.0, 1.0, 1.0, "Gd"),
+        (1.0, 0.0, 0.0, "Gd"),
+        (1.0, 0.0, 1.0, "Gd"),
+        (1.0, 1.0, 0.0, "Gd"),
+        (1.0, 1.0, 1.0, "Gd"),
+        (0.5, 1.0, 0.25, "Sb"),
+        (0.5, 0.0, 0.25, "Sb"),
+        (0.5, 0.5, 0.5, "Sb"),
+    ]
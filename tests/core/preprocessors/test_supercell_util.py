@@ -1,4 +1,12 @@
-from cifkit.preprocessors.supercell_util import _shift_xyz_plus_minus, get_cell_atom_count
+import numpy as np
+import pytest
+
+from cifkit.preprocessors.supercell_util import (
+    _shift_xyz_plus_minus,
+    get_cell_atom_count,
+    get_shifts,
+    get_supercell_extents,
+)
 
 
 def test_get_cell_atom_count_no_shift(unitcell_points_URhIn):
@@ -175,3 +183,30 @@ def test_shift_points_based_on_supercell_size_shift_by_two():
         [2, 2, 1],
         [2, 2, 2],
     ]
+
+
+@pytest.mark.fast
+def test_get_shifts():
+    assert get_shifts((1, 0, 0)) == [[-1, 0, 0], [0, 0, 0], [1, 0, 0]]
+    assert get_shifts((2, 2, 2)) == _shift_xyz_plus_minus(2)
+    assert len(get_shifts((1, 2, 3))) == 3 * 5 * 7
+
+
+@pytest.mark.parametrize(
+    "cutoff_radius, cell_lengths, cell_angles, expected_extents",
+    [
+        (10.0, [6.21, 6.21, 6.21], [90, 90, 90], (2, 2, 2)),
+        (10.0, [20.0, 20.0, 3.0], [90, 90, 90], (1, 1, 4)),
+        # The cell is thinner than 4 Å along a and b
+        (10.0, [4.0, 4.0, 6.0], [90, 90, 120], (3, 3, 2)),
+        (0.0, [4.0, 4.0, 4.0], [90, 90, 90], (0, 0, 0)),
+    ],
+)
+@pytest.mark.fast
+def test_get_supercell_extents(
+    cutoff_radius, cell_lengths, cell_angles, expected_extents
+):
+    assert (
+        get_supercell_extents(cutoff_radius, cell_lengths, np.radians(cell_angles))
+        == expected_extents
+    )
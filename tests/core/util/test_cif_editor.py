@@ -6,7 +6,14 @@ import tempfile
 import gemmi
 import pytest
 
-from cifkit.utils.cif_editor import add_hashtag_in_first_line, remove_author_loop
+from cifkit import Example
+from cifkit.utils.cif_editor import (
+    add_hashtag_in_first_line,
+    add_hashtag_in_first_line_of_content,
+    edit_cif_content_based_on_db,
+    remove_author_loop,
+    remove_author_loop_from_content,
+)
 from cifkit.utils.cif_parser import get_unitcell_lengths
 
 
@@ -43,3 +50,38 @@ def test_hashtag_in_first_line(tmpdir):
     doc = gemmi.cif.read_file(temp_file_path)
     block = doc.sole_block()
     assert get_unitcell_lengths(block) == [4.7, 4.7, 4.7]
+
+
+@pytest.mark.fast
+def test_edit_cif_content_in_memory():
+    content = "(C) 2024 FIZ Karlsruhe\ndata_x\n"
+    assert add_hashtag_in_first_line_of_content(content) == (
+        "# (C) 2024 FIZ Karlsruhe\ndata_x\n"
+    )
+
+    content = (
+        "loop_\n"
+        " _publ_author_name\n"
+        " _publ_author_address\n"
+        "'Doe J.'\n"
+        ";\n"
+        "Somewhere\n"
+        ";\n"
+        "\n"
+        "_cell_length_a 6.21\n"
+    )
+    assert remove_author_loop_from_content(content) == (
+        "loop_\n"
+        " _publ_author_name\n"
+        " _publ_author_address\n"
+        "''\n"
+        ";\n"
+        ";\n"
+        "\n"
+        "_cell_length_a 6.21\n"
+    )
+
+    # Formatted files are returned unchanged
+    with open(Example.GdSb_file_path, "r") as f:
+        content = f.read()
+    assert edit_cif_content_based_on_db(content, Example.GdSb_file_path) == content
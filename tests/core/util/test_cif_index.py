@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from cifkit import Example
+from cifkit.utils.cif_index import (
+    CifPack,
+    build_cif_index,
+    get_index_path,
+    load_cif_index,
+    pack_cif_files,
+)
+from cifkit.utils.cif_parser import get_cif_content
+from cifkit.utils.cif_reader import iter_cif_blocks
+
+GdSb_file_path = Example.GdSb_file_path
+HoSb_file_path = Example.GdSb_file_path.replace("GdSb", "HoSb")
+
+
+@pytest.fixture
+def multi_block_file_path(tmp_path):
+    file_path = tmp_path / "multi_block.cif"
+    file_path.write_text(
+        get_cif_content(GdSb_file_path)
+        + get_cif_content(HoSb_file_path)
+        + get_cif_content(GdSb_file_path)
+    )
+    return str(file_path)
+
+
+@pytest.mark.fast
+def test_build_cif_index(multi_block_file_path):
+    index = build_cif_index(multi_block_file_path)
+    # Repeated block names are suffixed with the occurrence count
+    assert list(index) == ["260569", "260247", "260569_2"]
+
+    with open(multi_block_file_path, "rb") as f:
+        content = f.read()
+    for (start, end), (_, block_content) in zip(
+        index.values(), iter_cif_blocks(multi_block_file_path)
+    ):
+        assert content[start:end].decode() == block_content
+
+
+@pytest.mark.fast
+def test_load_cif_index(multi_block_file_path):
+    index_path = get_index_path(multi_block_file_path)
+    index = load_cif_index(multi_block_file_path)
+    assert os.path.exists(index_path)
+    assert load_cif_index(multi_block_file_path) == index
+
+    # The index is rebuilt once the file changes
+    with open(multi_block_file_path, "a") as f:
+        f.write(get_cif_content(HoSb_file_path))
+    assert list(load_cif_index(multi_block_file_path)) == [
+        "260569",
+        "260247",
+        "260569_2",
+        "260247_2",
+    ]
+
+
+@pytest.mark.fast
+def test_pack_cif_files(tmp_path):
+    pack_path = str(tmp_path / "pack.cif")
+    index = pack_cif_files([GdSb_file_path, HoSb_file_path], pack_path)
+    assert list(index) == ["GdSb", "HoSb"]
+
+    with CifPack(pack_path) as pack:
+        assert len(pack) == 2
+        assert "HoSb" in pack
+        assert pack.get_content("HoSb").decode() == get_cif_content(HoSb_file_path)
+        cif = pack.get_cif("HoSb", supercell_size=1)
+        assert cif.formula == "HoSb"
+        assert cif.file_path == os.path.join(pack_path, "HoSb.cif")
+        assert cif.tag == "rt"
+
+
+@pytest.mark.fast
+def test_load_cif_index_unwritable(multi_block_file_path, tmp_path):
+    # The index is kept in memory if it cannot be saved
+    index_path = str(tmp_path / "missing_dir" / "multi_block.index.json")
+    assert list(load_cif_index(multi_block_file_path, index_path)) == [
+        "260569",
+        "260247",
+        "260569_2",
+    ]
+    assert not os.path.exists(index_path)
+
+
+@pytest.mark.fast
+def test_pack_cif_files_errors(tmp_path):
+    pack_path = str(tmp_path / "pack.cif")
+    # Files with the same name would share an ID
+    (tmp_path / "other").mkdir()
+    duplicate_file_path = str(tmp_path / "other" / "GdSb.cif")
+    with open(GdSb_file_path, "r") as f:
+        content = f.read()
+    with open(duplicate_file_path, "w") as f:
+        f.write(content)
+    with pytest.raises(ValueError, match="GdSb"):
+        pack_cif_files([GdSb_file_path, duplicate_file_path], pack_path)
+    assert not os.path.exists(pack_path)
+
+    # A changed pack is not reindexed by block name
+    pack_cif_files([GdSb_file_path, HoSb_file_path], pack_path)
+    with open(get_index_path(pack_path), "r") as f:
+        assert json.load(f)["key"] == "file_name"
+    with open(pack_path, "a") as f:
+        f.write(content)
+    with pytest.raises(ValueError, match="changed since it was indexed"):
+        load_cif_index(pack_path)
@@ -1,9 +1,15 @@
+import numpy as np
 import pytest
 
+from cifkit import Example
 from cifkit.utils import folder
 from cifkit.utils.cif_parser import (
     check_unique_atom_site_labels,
+    get_atom_site_info_from_table,
+    get_atom_site_table,
     get_cif_block,
+    get_cif_block_from_content,
+    get_cif_content,
     get_formula_structure_weight_s_group,
     get_label_occupancy_coordinates,
     get_line_content_from_tag,
@@ -18,6 +24,8 @@ from cifkit.utils.cif_parser import (
     get_unique_site_labels,
     get_unitcell_angles_rad,
     get_unitcell_lengths,
+    get_unitcell_parameters_and_uncertainties,
+    get_unitcell_uncertainties,
     parse_atom_site_occupancy_info,
 )
 from cifkit.utils.error_messages import CifParserError
@@ -192,6 +200,18 @@ def test_get_tag_from_third_line():
     assert get_tag_from_third_line(file_path) == "rt_hex"
 
 
+def test_parse_from_single_read_content():
+    file_path = Example.GdSb_file_path
+    content = get_cif_content(file_path)
+    block = get_cif_block_from_content(content)
+
+    assert get_unitcell_lengths(block) == get_unitcell_lengths(get_cif_block(file_path))
+    assert get_tag_from_third_line(file_path, content=content) == "rt"
+    assert parse_atom_site_occupancy_info(
+        file_path, block=block
+    ) == parse_atom_site_occupancy_info(file_path)
+
+
 @pytest.mark.fast
 def test_get_parsed_atom_site_occupancy_info(file_path_URhIn):
     atom_site_info = parse_atom_site_occupancy_info(file_path_URhIn)
@@ -306,3 +326,71 @@ def test_check_unique_atom_site_labels(file_path_URhIn):
     with pytest.raises(ValueError) as e:
         check_unique_atom_site_labels(unparsable_file_path)
     assert str(e.value) == "The element was not correctly parsed from the site label."
+
+
+@pytest.mark.fast
+def test_get_atom_site_table():
+    block = get_cif_block(Example.GdSb_file_path)
+    table, site_labels, elements = get_atom_site_table(block)
+
+    assert site_labels == ["Sb", "Gd"]
+    assert elements == ["Sb", "Gd"]
+    assert table["label_index"].tolist() == [0, 1]
+    assert table["element_index"].tolist() == [0, 1]
+    assert table["multiplicity"].tolist() == [4, 4]
+    assert table["wyckoff"].tolist() == ["b", "a"]
+    np.testing.assert_array_equal(table[["x", "y", "z"]].tolist(), [[0.5] * 3, [0.0] * 3])
+    assert table["occupancy"].tolist() == [1.0, 1.0]
+
+    atom_site_info = get_atom_site_info_from_table(table, site_labels, elements)
+    assert atom_site_info == parse_atom_site_occupancy_info(Example.GdSb_file_path)
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize(
+    "column_index, tag",
+    [
+        (4, "_atom_site_fract_x"),
+        (5, "_atom_site_fract_y"),
+        (6, "_atom_site_fract_z"),
+        (7, "_atom_site_occupancy"),
+    ],
+)
+def test_get_atom_site_table_missing_column(column_index, tag):
+    # Remove the tag and its values from the atom site loop
+    content = get_cif_content(Example.GdSb_file_path).replace(f" {tag}\n", "")
+    for row in [" Sb Sb 4 b 0.5 0.5 0.5 1", " Gd Gd 4 a 0 0 0 1"]:
+        values = row.split()
+        del values[column_index]
+        content = content.replace(row, " " + " ".join(values))
+    block = get_cif_block_from_content(content)
+
+    with pytest.raises(ValueError) as e:
+        get_atom_site_table(block)
+    assert str(e.value) == "Missing atomic coordinates"
+
+
+@pytest.mark.fast
+def test_get_uncertainties():
+    block = get_cif_block_from_content(
+        get_cif_content(Example.GdSb_file_path)
+        .replace("6.21\n", "6.210(3)\n")
+        .replace(" Sb Sb 4 b 0.5 0.5 0.5 1", " Sb Sb 4 b 0.5 0.5 0.5 0.95(2)")
+        .replace("279.0\n", "279.0(5)\n")
+    )
+    lengths_su, angles_su = get_unitcell_uncertainties(block)
+    np.testing.assert_array_equal(lengths_su, [0.003] * 3)
+    np.testing.assert_array_equal(angles_su, [np.nan] * 3)
+    assert get_unitcell_parameters_and_uncertainties(block)[:3] == (
+        get_unitcell_lengths(block),
+        get_unitcell_angles_rad(block),
+        lengths_su,
+    )
+
+    parsed_result = get_formula_structure_weight_s_group(block, with_weight_su=True)
+    assert (parsed_result[2], parsed_result[5]) == (279.0, 0.5)
+
+    table, _, _ = get_atom_site_table(block)
+    assert table["occupancy"].tolist() == [0.95, 1.0]
+    np.testing.assert_array_equal(table["occupancy_su"], [0.02, np.nan])
+    np.testing.assert_array_equal(table["x_su"], [np.nan, np.nan])
@@ -0,0 +1,103 @@
+import gzip
+import tarfile
+import zipfile
+
+import pytest
+
+from cifkit import Example
+from cifkit.utils.cif_parser import get_cif_content
+from cifkit.utils.cif_reader import (
+    is_archive,
+    iter_archive_members,
+    iter_cif_blocks,
+    iter_cif_headers,
+    iter_cifs,
+    iter_cifs_from_archive,
+)
+
+
+@pytest.fixture
+def multi_block_file_path(tmp_path):
+    file_path = tmp_path / "multi_block.cif"
+    file_path.write_text(
+        get_cif_content(Example.GdSb_file_path)
+        + get_cif_content(Example.GdSb_file_path.replace("GdSb", "HoSb"))
+        + get_cif_content("tests/data/cifs/CUMNON01_sb_only.cif")
+    )
+    return str(file_path)
+
+
+@pytest.mark.fast
+def test_iter_cif_blocks(multi_block_file_path):
+    blocks = list(iter_cif_blocks(multi_block_file_path))
+    assert [block_name for block_name, _ in blocks] == [
+        "260569",
+        "260247",
+        "mo_detasbcl_new_0m",
+    ]
+    # The header comments are kept with the block that follows them
+    assert blocks[0][1] == get_cif_content(Example.GdSb_file_path)
+    assert blocks[2][1] == get_cif_content("tests/data/cifs/CUMNON01_sb_only.cif")
+
+
+@pytest.mark.fast
+def test_iter_cif_blocks_ignores_text_fields(tmp_path):
+    file_path = tmp_path / "text_field.cif"
+    file_path.write_text("data_a\n_note\n;\ndata_not_a_block\n;\ndata_b\n")
+    assert [name for name, _ in iter_cif_blocks(str(file_path))] == ["a", "b"]
+
+
+@pytest.mark.fast
+def test_iter_cifs(multi_block_file_path):
+    cifs = list(iter_cifs(multi_block_file_path, supercell_size=1))
+    assert [cif.formula for cif in cifs] == ["GdSb", "HoSb", None]
+    assert [cif.db_source for cif in cifs] == ["PCD", "PCD", "CCDC"]
+    assert cifs[0].tag == "rt"
+    assert cifs[0].file_name == "260569.cif"
+
+    headers = list(iter_cif_headers(multi_block_file_path))
+    assert [header.formula for header in headers] == ["GdSb", "HoSb", None]
+
+
+@pytest.fixture
+def archive_dir_path(tmp_path):
+    GdSb_file_path = Example.GdSb_file_path
+    HoSb_file_path = GdSb_file_path.replace("GdSb", "HoSb")
+    with zipfile.ZipFile(tmp_path / "cifs.zip", "w") as archive:
+        archive.write(GdSb_file_path, "GdSb.cif")
+        archive.write(HoSb_file_path, "nested/HoSb.cif")
+        archive.writestr("README.txt", "Not a .cif file")
+    with tarfile.open(tmp_path / "cifs.tar.gz", "w:gz") as archive:
+        archive.add(GdSb_file_path, "GdSb.cif")
+        archive.add(HoSb_file_path, "nested/HoSb.cif")
+    with open(GdSb_file_path, "rb") as f, gzip.open(tmp_path / "GdSb.cif.gz", "wb") as gz:
+        gz.write(f.read())
+    return tmp_path
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("archive_name", ["cifs.zip", "cifs.tar.gz"])
+def test_iter_archive_members(archive_dir_path, archive_name):
+    archive_path = str(archive_dir_path / archive_name)
+    assert is_archive(archive_path)
+    members = list(iter_archive_members(archive_path))
+    assert [file_path for file_path, _ in members] == [
+        f"{archive_path}/GdSb.cif",
+        f"{archive_path}/nested/HoSb.cif",
+    ]
+    with open(Example.GdSb_file_path, "rb") as f:
+        assert members[0][1] == f.read()
+
+
+@pytest.mark.fast
+def test_iter_cifs_from_archive(archive_dir_path):
+    archive_path = str(archive_dir_path / "cifs.tar.gz")
+    cifs = list(iter_cifs_from_archive(archive_path, supercell_size=1))
+    assert [cif.formula for cif in cifs] == ["GdSb", "HoSb"]
+    assert [cif.file_name for cif in cifs] == ["GdSb.cif", "HoSb.cif"]
+
+    gz_file_path = str(archive_dir_path / "GdSb.cif.gz")
+    cif = next(iter_cifs_from_archive(gz_file_path, supercell_size=1))
+    assert cif.file_path == str(archive_dir_path / "GdSb.cif")
+    assert cif.db_source == "PCD"
+    assert cif.tag == "rt"
@@ -0,0 +1,47 @@
+import pytest
+
+from cifkit import Cif, Example
+from cifkit.utils.cif_parser import get_cif_content
+from cifkit.utils.cif_scanner import scan_cif_dir, scan_cif_file, scan_cif_header
+
+
+@pytest.mark.fast
+def test_scan_cif_file():
+    header = scan_cif_file(Example.GdSb_file_path)
+    assert header.file_name == "GdSb.cif"
+    assert header.db_source == "PCD"
+    assert header.tag == "rt"
+    assert header.formula == "GdSb"
+    assert header.structure == "NaCl"
+    assert header.weight == 279.0
+    assert header.space_group_number == 225
+    assert header.space_group_name == "Fm-3m"
+    assert header.unique_elements == {"Gd", "Sb"}
+    assert header.composition_type == 2
+    assert header.site_count == 2
+
+
+@pytest.mark.fast
+def test_scan_cif_header_matches_cif():
+    content = get_cif_content("tests/data/cifs/CUMNON01_sb_only.cif")
+    header = scan_cif_header(content, "CUMNON01_sb_only.cif")
+    cif = Cif("tests/data/cifs/CUMNON01_sb_only.cif")
+    for attribute in [
+        "db_source",
+        "tag",
+        "formula",
+        "structure",
+        "weight",
+        "space_group_number",
+        "space_group_name",
+        "unique_elements",
+        "composition_type",
+    ]:
+        assert getattr(header, attribute) == getattr(cif, attribute)
+    assert header.site_count == len(cif.site_labels)
+
+
+@pytest.mark.fast
+def test_scan_cif_dir():
+    headers = scan_cif_dir(Example.demo_cif_folder_path)
+    assert {header.formula for header in headers} == {"GdSb", "HoSb"}
@@ -18,3 +18,22 @@ def test_check_cif_file_known_databases():
 
     PCD_file = "tests/data/cif/sources/PCD/250117.cif"
     assert get_cif_db_source(PCD_file) == "PCD"
+
+
+@pytest.mark.fast
+def test_get_cif_db_source_from_content():
+    with open("tests/data/cifs/CUMNON01_sb_only.cif", "rb") as f:
+        content = f.read()
+    assert get_cif_db_source("CUMNON01_sb_only.cif", content=content) == "CCDC"
+    assert get_cif_db_source("", content=content.decode()) == "CCDC"
+    # The identifier is beyond the searched prefix
+    assert get_cif_db_source("", content=content, max_bytes=100) == "Unknown"
+    assert get_cif_db_source("", content=content, max_bytes=None) == "CCDC"
+
+
+@pytest.mark.fast
+def test_get_cif_db_source_bounded_file_read(tmp_path):
+    file_path = tmp_path / "late_identifier.cif"
+    file_path.write_text("data_x\n" + "#\n" * 20000 + "#_database_code_PCD 1\n")
+    assert get_cif_db_source(str(file_path)) == "Unknown"
+    assert get_cif_db_source(str(file_path), max_bytes=None) == "PCD"
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from cifkit.utils.lattice import Lattice
+from cifkit.utils.unit import fractional_to_cartesian
+
+
+@pytest.mark.fast
+def test_lattice_get_cartesian_coords():
+    lengths = [4.2, 5.1, 7.3]
+    angles_rad = np.radians([82.0, 97.5, 111.0]).tolist()
+    lattice = Lattice(lengths, angles_rad)
+    fractional_coords = np.random.default_rng(0).uniform(-1.0, 2.0, (100, 3))
+
+    cartesian_coords = lattice.get_cartesian_coords(fractional_coords)
+    expected = np.array(
+        [fractional_to_cartesian(f, lengths, angles_rad) for f in fractional_coords]
+    )
+    # Identical to converting one point at a time
+    assert np.array_equal(cartesian_coords, expected)
+    assert np.allclose(lattice.get_fractional_coords(cartesian_coords), fractional_coords)
+
+    # Distances from the metric tensor match the Cartesian distances
+    assert np.allclose(
+        lattice.get_distances(fractional_coords[:-1], fractional_coords[1:]),
+        np.linalg.norm(np.diff(cartesian_coords, axis=0), axis=1),
+    )
+
+
+@pytest.mark.fast
+def test_lattice_cubic():
+    lattice = Lattice([2.0, 2.0, 2.0], np.radians([90, 90, 90]).tolist())
+    assert np.allclose(lattice.metric_tensor, np.eye(3) * 4.0)
+    assert np.isclose(lattice.volume, 8.0)
+    assert lattice.get_cartesian_coords(np.empty((0, 3))).shape == (0, 3)
@@ -0,0 +1,21 @@
+import pytest
+
+from cifkit.utils.parallel import get_worker_count, map_in_processes
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize("n_workers", [1, 2, None])
+def test_map_in_processes(n_workers):
+    items = [str(i) for i in range(20)]
+    assert map_in_processes(int, items, n_workers=n_workers) == list(range(20))
+
+    # The first error in the order of the items is raised
+    with pytest.raises(ValueError, match="'a'"):
+        map_in_processes(int, ["1", "a", "b"], n_workers=n_workers)
+
+
+@pytest.mark.fast
+def test_get_worker_count():
+    assert get_worker_count(4) == 4
+    assert get_worker_count(0) == 1
+    assert get_worker_count(None) >= 1
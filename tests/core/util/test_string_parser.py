@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from cifkit.utils.error_messages import GeneralError
@@ -5,6 +6,7 @@ from cifkit.utils.string_parser import (
     clean_parsed_structure,
     get_atom_type_from_label,
     get_string_to_formatted_float,
+    get_strings_to_floats_and_uncertainties,
     strip_numbers_and_symbols,
     trim_string,
 )
@@ -110,3 +112,17 @@ def test_strip_numbers_and_symbols(input_value, expected_output):
     assert (
         strip_numbers_and_symbols(input_value) == expected_output
     ), f"Failed for input: {input_value}"
+
+
+@pytest.mark.fast
+def test_get_strings_to_floats_and_uncertainties():
+    values, uncertainties = get_strings_to_floats_and_uncertainties(
+        ["7.476(2)", " 123 (45) ", "45", "-123.456(789)", "0.2315(3)", "1.5E-3(2)"]
+    )
+    assert values.tolist() == [7.476, 123, 45, -123.456, 0.2315, 0.0015]
+    np.testing.assert_array_equal(
+        uncertainties, [0.002, 45, np.nan, 0.789, 0.0003, 0.0002]
+    )
+
+    values, uncertainties = get_strings_to_floats_and_uncertainties([])
+    assert values.size == uncertainties.size == 0
@@ -3,6 +3,7 @@ import pytest
 
 from cifkit.utils.unit import (
     fractional_to_cartesian,
+    get_interplanar_spacings,
     get_radians_from_degrees,
     round_dict_values,
     round_float,
@@ -74,3 +75,14 @@ def test_round_dict_values():
     assert (
         round_dict_values(input_dict) == expected_dict
     ), "The dictionary values were not rounded correctly."
+
+
+@pytest.mark.fast
+def test_get_interplanar_spacings():
+    # Orthorhombic cells have the cell lengths as spacings
+    spacings = get_interplanar_spacings([3.0, 4.0, 5.0], np.radians([90, 90, 90]))
+    assert np.allclose(spacings, [3.0, 4.0, 5.0])
+
+    # Hexagonal cells are thinner than a along a
+    spacings = get_interplanar_spacings([4.0, 4.0, 6.0], np.radians([90, 90, 120]))
+    assert np.allclose(spacings, [4.0 * np.sqrt(3) / 2, 4.0 * np.sqrt(3) / 2, 6.0])